@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import queue
+import sys
+from dotenv import load_dotenv
+from src.database.database import Database, SYNCHRONOUS_MODES
+from src.database.write_behind import WriteBehindQueue, DEFAULT_FLUSH_INTERVAL
+from src.controllers.auth_controller import AuthController
+from src.controllers.download_controller import DownloadController
+from src.controllers.download_engine import DownloadEngine
+from src.controllers.download_queue import DEFAULT_MAX_WORKERS, DEFAULT_KEEP_FINISHED
+from src.models.download_job import DownloadJob, FORMATS
+from src.utils.file_utils import ensure_dir
+from src.utils.validators import validate_youtube_url, validate_youtube_collection_url
+
+def parse_args(argv=None):
+    """Komut satırı parametrelerini okur"""
+    parser = argparse.ArgumentParser(
+        description='YouTube indirme uygulamasını arayüz olmadan çalıştırır. '
+                    'İlerleme satır başına bir JSON nesnesi olarak yazılır.'
+    )
+    parser.add_argument('-i', '--input', default='-',
+                        help="URL listesi dosyası, '-' ise standart girdi")
+    parser.add_argument('-o', '--output-dir',
+                        default=os.path.join(os.path.expanduser('~'), 'Downloads', 'YouTube Downloads'),
+                        help='İndirme klasörü')
+    parser.add_argument('-f', '--format', choices=sorted(FORMATS), default='video')
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help='Aynı anda çalışan indirme sayısı')
+    parser.add_argument('-c', '--connections', type=int, default=1,
+                        help='Progresif formatlarda iş başına bağlantı sayısı')
+    parser.add_argument('--rate-limit', type=float, default=0,
+                        help='Toplam hız sınırı (MB/s), 0 ise sınırsız')
+    parser.add_argument('--stream-audio', action='store_true',
+                        help='Ses indirmelerini ara dosya yazmadan doğrudan MP3\'e dönüştürür')
+    parser.add_argument('--preallocate', action='store_true',
+                        help='Çoklu bağlantılı indirmelerde dosyayı baştan tam boyutta ayırır')
+    parser.add_argument('--flush-interval', type=float, default=DEFAULT_FLUSH_INTERVAL,
+                        help='Veritabanı yazımlarının toplanacağı süre (sn), 0 ise hemen yazılır')
+    parser.add_argument('--synchronous', choices=SYNCHRONOUS_MODES, default='NORMAL',
+                        type=str.upper, help='SQLite synchronous ayarı')
+    parser.add_argument('-u', '--username', default=os.environ.get('YTD_USERNAME'))
+    parser.add_argument('-p', '--password', default=os.environ.get('YTD_PASSWORD'))
+    return parser.parse_args(argv)
+
+def read_urls(path):
+    """Dosyadan veya standart girdiden URL'leri satır satır okur"""
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line in stream:
+            url = line.strip()
+            if url and not url.startswith('#'):
+                yield url
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def emit(event, **fields):
+    """Olayı tek satırlık JSON olarak yazar"""
+    fields['event'] = event
+    sys.stdout.write(json.dumps(fields, ensure_ascii=False, default=str) + '\n')
+    sys.stdout.flush()
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv)
+
+    if not args.username or not args.password:
+        emit('error', message='Kullanıcı adı ve şifre gerekli (--username/--password '
+                              'veya YTD_USERNAME/YTD_PASSWORD)')
+        return 2
+
+    # Veritabanı ve kontrolcüler
+    db = Database(synchronous=args.synchronous)
+    db.migrate()
+    writer = WriteBehindQueue(db, flush_interval=args.flush_interval)
+    auth_controller = AuthController(db)
+    download_controller = DownloadController(db, writer)
+
+    user = auth_controller.login(args.username, args.password)
+    if not user:
+        emit('error', message='Kullanıcı adı veya şifre hatalı')
+        return 2
+
+    ensure_dir(args.output_dir)
+
+    engine = DownloadEngine(
+        db,
+        download_controller,
+        max_workers=args.workers,
+        rate_limit=args.rate_limit * 1024 * 1024 if args.rate_limit else None,
+        preallocate=args.preallocate,
+        writer=writer,
+        keep_finished=DEFAULT_KEEP_FINISHED
+    )
+    download_queue = engine.queue
+
+    # Olaylar işçi thread'lerinden gelir; veritabanı yazımı ana thread'de yapılır
+    events = queue.Queue()
+    download_queue.add_listener(lambda event, job: events.put((event, job.to_dict(), job)))
+
+    discoveries = []
+    for url in read_urls(args.input):
+        if validate_youtube_collection_url(url):
+            discoveries.append(download_queue.submit_collection(
+                url, args.output_dir, FORMATS[args.format], user.id,
+                connections=args.connections, stream_audio=args.stream_audio))
+        elif validate_youtube_url(url):
+            download_queue.submit(url, args.output_dir, FORMATS[args.format], user.id,
+                                  connections=args.connections, stream_audio=args.stream_audio)
+        else:
+            emit('error', url=url, message='Geçersiz YouTube URL\'si')
+
+    added = finished = failed = 0
+    try:
+        while True:
+            try:
+                event, data, job = events.get(timeout=0.5)
+            except queue.Empty:
+                # Keşif bittiyse tüm 'added' olayları kuyruğa düşmüştür
+                if added == finished and not any(t.is_alive() for t in discoveries):
+                    break
+                continue
+
+            emit(event, job=data)
+            if event == 'added':
+                added += 1
+            elif event == 'finished':
+                finished += 1
+                if job.state == DownloadJob.COMPLETED:
+                    download_controller.add_job_download(job)
+                elif job.state == DownloadJob.FAILED:
+                    failed += 1
+    except KeyboardInterrupt:
+        emit('error', message='İptal edildi')
+        failed += 1
+    finally:
+        engine.shutdown()
+        writer.close()
+
+    emit('done', failed=failed)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
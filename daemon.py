@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+from dotenv import load_dotenv
+from src.database.database import Database, SYNCHRONOUS_MODES
+from src.database.write_behind import WriteBehindQueue, DEFAULT_FLUSH_INTERVAL
+from src.controllers.auth_controller import AuthController
+from src.controllers.download_controller import DownloadController
+from src.controllers.download_engine import DownloadEngine
+from src.controllers.download_queue import DEFAULT_MAX_WORKERS, DEFAULT_KEEP_FINISHED
+from src.controllers.daemon_server import DaemonServer, DEFAULT_HOST, DEFAULT_PORT
+from src.models.download_job import DownloadJob
+from src.utils.file_utils import ensure_dir
+
+def parse_args(argv=None):
+    """Komut satırı parametrelerini okur"""
+    parser = argparse.ArgumentParser(
+        description='İndirme motorunu ve veritabanını tek süreçte tutar, '
+                    'işleri yerel HTTP/JSON API üzerinden kabul eder.'
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('-o', '--output-dir',
+                        default=os.path.join(os.path.expanduser('~'), 'Downloads', 'YouTube Downloads'),
+                        help='İndirme kök klasörü; API yalnızca bunun altına indirir')
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help='Aynı anda çalışan indirme sayısı')
+    parser.add_argument('--rate-limit', type=float, default=0,
+                        help='Toplam hız sınırı (MB/s), 0 ise sınırsız')
+    parser.add_argument('--preallocate', action='store_true',
+                        help='Çoklu bağlantılı indirmelerde dosyayı baştan tam boyutta ayırır')
+    parser.add_argument('--flush-interval', type=float, default=DEFAULT_FLUSH_INTERVAL,
+                        help='Veritabanı yazımlarının toplanacağı süre (sn), 0 ise hemen yazılır')
+    parser.add_argument('--synchronous', choices=SYNCHRONOUS_MODES, default='NORMAL',
+                        type=str.upper, help='SQLite synchronous ayarı')
+    return parser.parse_args(argv)
+
+def log(event, **fields):
+    """Olayı tek satırlık JSON olarak yazar"""
+    fields['event'] = event
+    sys.stdout.write(json.dumps(fields, ensure_ascii=False, default=str) + '\n')
+    sys.stdout.flush()
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv)
+
+    # Veritabanı ve kontrolcüler
+    db = Database(synchronous=args.synchronous)
+    db.migrate()
+    writer = WriteBehindQueue(db, flush_interval=args.flush_interval)
+    auth_controller = AuthController(db)
+    download_controller = DownloadController(db, writer)
+
+    ensure_dir(args.output_dir)
+
+    engine = DownloadEngine(
+        db,
+        download_controller,
+        max_workers=args.workers,
+        rate_limit=args.rate_limit * 1024 * 1024 if args.rate_limit else None,
+        preallocate=args.preallocate,
+        writer=writer,
+        keep_finished=DEFAULT_KEEP_FINISHED
+    )
+
+    # Olaylar işçi thread'lerinden gelir; veritabanı yazımı ana thread'de yapılır
+    events = queue.Queue()
+    engine.queue.add_listener(lambda event, job: events.put((event, job)))
+
+    # Önceki çalıştırmadan yarım kalan işleri sürdür
+    # Başka bir canlı sürecin işleri devralınmaz
+    for entry in engine.journal.claim_unfinished():
+        engine.queue.submit_journaled(entry)
+
+    try:
+        server = DaemonServer((args.host, args.port), engine.queue, auth_controller, args.output_dir)
+    except OSError as e:
+        log('error', message=f'Sunucu başlatılamadı: {e}')
+        engine.shutdown()
+        writer.close()
+        return 1
+
+    threading.Thread(target=server.serve_forever, name='daemon-http', daemon=True).start()
+    log('listening', host=args.host, port=server.server_port)
+
+    try:
+        while True:
+            event, job = events.get()
+            if event in ('added', 'started', 'finished'):
+                log(event, job=job.to_dict())
+            if event == 'finished' and job.state == DownloadJob.COMPLETED:
+                download_controller.add_job_download(job)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        engine.shutdown()
+        writer.close()
+
+    log('stopped')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,15 @@
 import sys
 import os
-from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget
+from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget, QMessageBox
 from PyQt5.QtCore import Qt
 from src.views.login_view import LoginView
 from src.views.register_view import RegisterView
 from src.views.main_view import MainView
 from src.database.database import Database
+from src.database.write_behind import WriteBehindQueue
 from src.controllers.auth_controller import AuthController
 from src.controllers.download_controller import DownloadController
+from src.controllers.download_engine import DownloadEngine
 from src.utils.file_utils import ensure_dir
 
 class App(QMainWindow):
@@ -35,16 +37,27 @@ class App(QMainWindow):
         # İndirme dizinini oluştur
         downloads_dir = os.path.join(os.path.expanduser('~'), 'Downloads', 'YouTube Downloads')
         ensure_dir(downloads_dir)
+        
+        # Yarım kalan indirmeleri sürdür
+        self.resume_unfinished_jobs()
     
     def init_database(self):
-        """Veritabanı bağlantısını başlatır"""
+        """Veritabanı bağlantısını başlatır ve şemayı günceller"""
         self.db = Database()
-        self.db.create_tables()
+        self.db.migrate()
+        # İş durumu ve geçmiş kayıtları toplu yazılır
+        self.db_writer = WriteBehindQueue(self.db)
     
     def init_controllers(self):
         """Kontrolcüleri başlatır"""
         self.auth_controller = AuthController(self.db)
-        self.download_controller = DownloadController(self.db)
+        self.download_controller = DownloadController(self.db, self.db_writer)
+        self.download_engine = DownloadEngine(self.db, self.download_controller,
+                                              writer=self.db_writer)
+        self.download_queue = self.download_engine.queue
+        self.job_journal = self.download_engine.journal
+        self.bandwidth_governor = self.download_engine.governor
+        self.thumbnail_store = self.download_engine.thumbnail_store
     
     def init_ui(self):
         """Arayüz bileşenlerini oluşturur"""
@@ -65,6 +78,26 @@ class App(QMainWindow):
         # Başlangıç görünümünü ayarla
         self.show_login()
     
+    def resume_unfinished_jobs(self):
+        """Önceki oturumdan yarım kalan indirmeleri sürdürmeyi önerir"""
+        jobs = self.job_journal.claim_unfinished()
+        if not jobs:
+            return
+        
+        reply = QMessageBox.question(
+            self,
+            'Yarım Kalan İndirmeler',
+            f'{len(jobs)} indirme yarım kaldı. Kaldığı yerden devam edilsin mi?',
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes
+        )
+        
+        for job in jobs:
+            if reply == QMessageBox.Yes:
+                self.download_queue.submit_journaled(job)
+            else:
+                self.job_journal.set_state(job['id'], 'abandoned')
+    
     def show_login(self):
         """Giriş ekranını gösterir"""
         self.current_user = None
@@ -98,6 +131,12 @@ class App(QMainWindow):
         self.current_user = None
         self.show_login()
 
+    def closeEvent(self, event):
+        """Pencere kapanırken indirme işçilerini durdurur ve bekleyen yazımları aktarır"""
+        self.download_engine.shutdown()
+        self.db_writer.close()
+        super().closeEvent(event)
+
 if __name__ == '__main__':
     # Yüksek DPI desteği
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):
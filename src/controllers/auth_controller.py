@@ -12,12 +12,11 @@ class AuthController:
             hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
             
             # Kullanıcıyı veritabanına kaydet
-            cursor = self.db.conn.cursor()
-            cursor.execute('''
-                INSERT INTO users (username, password, email)
-                VALUES (?, ?, ?)
-            ''', (username, hashed, email))
-            self.db.conn.commit()
+            with self.db.conn as conn:
+                conn.execute('''
+                    INSERT INTO users (username, password, email)
+                    VALUES (?, ?, ?)
+                ''', (username, hashed, email))
             return True
         except Exception as e:
             print(f"Kayıt hatası: {e}")
@@ -46,8 +45,8 @@ class AuthController:
             
             if row and bcrypt.checkpw(old_password.encode('utf-8'), row['password']):
                 hashed = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
-                cursor.execute('UPDATE users SET password = ? WHERE id = ?', (hashed, user_id))
-                self.db.conn.commit()
+                with self.db.conn as conn:
+                    conn.execute('UPDATE users SET password = ? WHERE id = ?', (hashed, user_id))
                 return True
             return False
         except Exception as e:
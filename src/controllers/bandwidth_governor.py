@@ -0,0 +1,76 @@
+import itertools
+import threading
+import time
+
+class BandwidthGovernor:
+    """Tüm indirme işçilerinin paylaştığı token bucket hız sınırlayıcı.
+
+    İşler her veri parçası için consume(key, amount) çağırır. Bekleyenler
+    arasında o ana kadar en az bayt almış işe öncelik verilir; böylece
+    büyük parçalarla okuyan bir iş diğerlerini aç bırakamaz. rate None ise
+    sınır yoktur.
+    """
+
+    def __init__(self, rate=None, burst_seconds=1.0):
+        self.burst_seconds = burst_seconds
+        self.rate = None
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+        self._served = {}
+        self._waiters = {}
+        self._tickets = itertools.count()
+        self._cond = threading.Condition()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        """Toplam hız sınırını (bayt/saniye) çalışma anında değiştirir"""
+        with self._cond:
+            self._refill()
+            self.rate = float(rate) if rate else None
+            if self.rate:
+                self._tokens = min(self._tokens, self.rate * self.burst_seconds)
+            self._cond.notify_all()
+
+    def release(self, key):
+        """Biten işin paylaşım kaydını siler"""
+        with self._cond:
+            self._served.pop(key, None)
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate:
+            capacity = self.rate * self.burst_seconds
+            self._tokens = min(capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _next_waiter(self):
+        return min(self._waiters, key=lambda ticket: (self._served[self._waiters[ticket]], ticket))
+
+    def consume(self, key, amount):
+        """key işi için amount bayt izni alınana kadar bekler"""
+        if amount <= 0 or not self.rate:
+            return
+
+        with self._cond:
+            if key not in self._served:
+                # Yeni gelen iş, mevcut işlerin gerisinde başlamasın diye en azdan başlar
+                self._served[key] = min(self._served.values(), default=0)
+
+            ticket = next(self._tickets)
+            self._waiters[ticket] = key
+            try:
+                while True:
+                    if not self.rate:
+                        return
+                    self._refill()
+                    is_next = self._next_waiter() == ticket
+                    if is_next and self._tokens > 0:
+                        # Borçlanmaya izin verilir, ortalama hız yine de korunur
+                        self._tokens -= amount
+                        self._served[key] += amount
+                        return
+                    timeout = -self._tokens / self.rate + 0.001 if is_next else None
+                    self._cond.wait(timeout)
+            finally:
+                del self._waiters[ticket]
+                self._cond.notify_all()
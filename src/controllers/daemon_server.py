@@ -0,0 +1,248 @@
+import json
+import os
+import re
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.models.download_job import DownloadJob, FORMATS, MAX_CONNECTIONS
+from src.utils.file_utils import ensure_dir
+from src.utils.validators import validate_youtube_url, validate_youtube_collection_url
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """İndirme kuyruğu için JSON API.
+
+    POST /session              {"username", "password"} ile oturum açar, {"token"} döndürür
+
+    Diğer adresler 'Authorization: Bearer <token>' başlığı ister; her
+    kullanıcı yalnızca kendi işlerini görür ve değiştirir.
+
+    GET  /jobs                 işleri listeler
+    GET  /jobs/<id>            tek işi döndürür
+    POST /jobs                 {"url", "format", "download_path", "connections", "priority",
+                                "stream_audio"}
+    POST /jobs/<id>/cancel     işi iptal eder
+    POST /jobs/<id>/pause      işi duraklatır, yarım dosya korunur; çalışan ses
+                               akışı işi duraklatılamaz (409)
+    POST /jobs/<id>/resume     duraklatılan işi sürdürür
+    POST /jobs/<id>/priority   {"priority"} ile önceliği değiştirir
+    """
+
+    server_version = 'YouTubeDownloaderDaemon/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def authenticate(self):
+        """İsteğin oturum kullanıcısını döndürür, yoksa 401 yanıtı verir"""
+        scheme, _, token = self.headers.get('Authorization', '').partition(' ')
+        user = self.server.session_user(token.strip()) if scheme.lower() == 'bearer' else None
+        if user is None:
+            body = json.dumps({'error': 'Oturum gerekli'}, ensure_ascii=False).encode('utf-8')
+            self.send_response(401)
+            self.send_header('WWW-Authenticate', 'Bearer')
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        return user
+
+    def find_job(self, job_id, user):
+        """Kullanıcının işini döndürür; başkasının işi yokmuş gibi davranılır"""
+        job = self.server.download_queue.get_job(job_id)
+        return job if job and job.user_id == user.id else None
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            data = json.loads(self.rfile.read(length).decode('utf-8'))
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def do_GET(self):
+        user = self.authenticate()
+        if user is None:
+            return
+        download_queue = self.server.download_queue
+
+        if self.path == '/jobs':
+            jobs = [job for job in list(download_queue.jobs.values()) if job.user_id == user.id]
+            jobs.sort(key=lambda job: (-job.priority, job.id))
+            self.send_json(200, [job.to_dict() for job in jobs])
+            return
+
+        match = re.fullmatch(r'/jobs/(\d+)', self.path)
+        if match:
+            job = self.find_job(int(match.group(1)), user)
+            if job:
+                self.send_json(200, job.to_dict())
+            else:
+                self.send_json(404, {'error': 'İş bulunamadı'})
+            return
+
+        self.send_json(404, {'error': 'Bilinmeyen adres'})
+
+    def do_POST(self):
+        data = self.read_json()
+        if data is None:
+            self.send_json(400, {'error': 'Geçersiz JSON'})
+            return
+
+        if self.path == '/session':
+            self.create_session(data)
+            return
+
+        user = self.authenticate()
+        if user is None:
+            return
+
+        if self.path == '/jobs':
+            self.submit_job(data, user)
+            return
+
+        match = re.fullmatch(r'/jobs/(\d+)/(cancel|pause|resume|priority)', self.path)
+        if not match:
+            self.send_json(404, {'error': 'Bilinmeyen adres'})
+            return
+
+        job_id, action = int(match.group(1)), match.group(2)
+        download_queue = self.server.download_queue
+        if self.find_job(job_id, user) is None:
+            self.send_json(404, {'error': 'İş bulunamadı'})
+            return
+
+        if action == 'cancel':
+            ok = download_queue.cancel(job_id)
+        elif action == 'pause':
+            job = download_queue.get_job(job_id)
+            if job.state == DownloadJob.RUNNING and not job.resumable:
+                self.send_json(409, {'error': 'Ses akışı indirmesi duraklatılamaz, '
+                                              'yalnızca iptal edilebilir'})
+                return
+            ok = download_queue.pause(job_id)
+        elif action == 'resume':
+            ok = download_queue.resume(job_id)
+        else:
+            try:
+                ok = download_queue.set_priority(job_id, int(data.get('priority', 0)))
+            except (TypeError, ValueError):
+                self.send_json(400, {'error': 'Geçersiz öncelik'})
+                return
+
+        if ok:
+            self.send_json(200, download_queue.get_job(job_id).to_dict())
+        else:
+            self.send_json(409, {'error': 'İş bu durumda değiştirilemez'})
+
+    def create_session(self, data):
+        username = str(data.get('username', ''))
+        password = str(data.get('password', ''))
+        user = self.server.auth_controller.login(username, password) if username and password else None
+        if user is None:
+            self.send_json(401, {'error': 'Kullanıcı adı veya şifre hatalı'})
+            return
+        self.send_json(201, {'token': self.server.create_session(user), 'user': user.to_dict()})
+
+    def submit_job(self, data, user):
+        url = str(data.get('url', '')).strip()
+        format_id = FORMATS.get(data.get('format', 'video'))
+        if format_id is None:
+            self.send_json(400, {'error': 'Format video veya audio olmalı'})
+            return
+
+        try:
+            # Her bağlantı ayrı bir thread açar; arayüzdeki 1-8 aralığına sınırlanır
+            connections = max(1, min(int(data.get('connections', 1)), MAX_CONNECTIONS))
+            priority = int(data.get('priority', 0))
+        except (TypeError, ValueError):
+            self.send_json(400, {'error': 'Geçersiz parametre'})
+            return
+
+        stream_audio = data.get('stream_audio', False)
+        if not isinstance(stream_audio, bool):
+            # bool("false") True olacağından yalnızca JSON true/false kabul edilir
+            self.send_json(400, {'error': 'stream_audio true veya false olmalı'})
+            return
+
+        download_queue = self.server.download_queue
+        download_path = self.server.resolve_download_path(data.get('download_path'))
+        if download_path is None:
+            self.send_json(400, {'error': 'İndirme klasörü daemon klasörünün dışında olamaz'})
+            return
+        try:
+            ensure_dir(download_path)
+        except OSError as e:
+            self.send_json(400, {'error': f'İndirme klasörü oluşturulamadı: {e}'})
+            return
+        user_id = user.id
+
+        if validate_youtube_collection_url(url):
+            download_queue.submit_collection(url, download_path, format_id, user_id,
+                                             connections=connections, priority=priority,
+                                             stream_audio=stream_audio)
+            self.send_json(202, {'url': url, 'collection': True})
+        elif validate_youtube_url(url):
+            job = download_queue.submit(url, download_path, format_id, user_id,
+                                        connections=connections, priority=priority,
+                                        stream_audio=stream_audio)
+            self.send_json(201, job.to_dict())
+        else:
+            self.send_json(400, {'error': 'Geçersiz YouTube URL\'si'})
+
+class DaemonServer(ThreadingHTTPServer):
+    """İndirme motorunu yerel HTTP/JSON API ile paylaşır.
+
+    Oturumlar bellekte tutulur ve daemon kapanınca geçersiz olur. İşler
+    yalnızca download_path kökü ve altındaki klasörlere indirilebilir.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, download_queue, auth_controller, download_path):
+        super().__init__(address, DaemonRequestHandler)
+        self.download_queue = download_queue
+        self.auth_controller = auth_controller
+        self.download_path = os.path.realpath(download_path)
+        self.sessions = {}
+        self.sessions_lock = threading.Lock()
+
+    def create_session(self, user):
+        """Kullanıcı için yeni oturum anahtarı üretir"""
+        token = secrets.token_urlsafe(32)
+        with self.sessions_lock:
+            self.sessions[token] = user
+        return token
+
+    def session_user(self, token):
+        """Oturum anahtarının kullanıcısını, geçersizse None döndürür"""
+        if not token:
+            return None
+        with self.sessions_lock:
+            return self.sessions.get(token)
+
+    def resolve_download_path(self, path):
+        """İstenen klasörü kök altında çözer; kökün dışındaysa None döndürür.
+        Göreli yollar köke göre yorumlanır."""
+        if not path:
+            return self.download_path
+        try:
+            resolved = os.path.realpath(os.path.join(self.download_path, str(path)))
+            # Windows'ta farklı sürücüdeki yollar için ValueError fırlatılır
+            if os.path.commonpath([self.download_path, resolved]) != self.download_path:
+                return None
+        except ValueError:
+            return None
+        return resolved
@@ -0,0 +1,82 @@
+import errno
+import os
+import shutil
+import threading
+
+# Dosya sistemi ve diğer uygulamalar için boş bırakılan alan
+DEFAULT_MARGIN = 200 * 1024 * 1024
+
+class InsufficientDiskSpace(OSError):
+    """Hedef diskte işe yetecek boş alan olmadığında fırlatılır.
+
+    waiting True ise aynı diskte yer ayırmış başka işler vardır; onlar
+    bitince alan açılabileceği için iş beklemeye alınabilir.
+    """
+
+    def __init__(self, needed, available, waiting=False):
+        super().__init__(errno.ENOSPC, 'Yetersiz disk alanı: '
+                         f'{needed // (1024 * 1024)} MB gerekli, '
+                         f'{max(0, available) // (1024 * 1024)} MB kullanılabilir')
+        self.needed = needed
+        self.available = available
+        self.waiting = waiting
+
+def _existing_dir(path):
+    path = os.path.abspath(path)
+    while not os.path.isdir(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+def estimate_size(info):
+    """Seçilen format(lar)ın tahmini boyutunu, bilinmiyorsa None döndürür"""
+    formats = info.get('requested_formats') or [info]
+    total = 0
+    for fmt in formats:
+        size = fmt.get('filesize') or fmt.get('filesize_approx')
+        if not size:
+            return None
+        total += int(size)
+    return total
+
+class DiskSpaceGuard:
+    """İşleri başlatmadan önce hedef diskte yer olup olmadığını denetler.
+
+    Her iş tahmini boyutu kadar yer ayırır. Ayrılan alanın henüz
+    indirilmemiş kısmı boş alandan düşülür; böylece aynı diske yazan
+    paralel işler birbirinin yerini kullanamaz. preallocate açıksa çoklu
+    bağlantılı indirmeler dosyayı baştan tam boyutta ayırır.
+    """
+
+    def __init__(self, margin=DEFAULT_MARGIN, preallocate=False):
+        self.margin = margin
+        self.preallocate = preallocate
+        self._reservations = {}
+        self._lock = threading.Lock()
+
+    def _outstanding(self, device, exclude=None):
+        total = 0
+        for job, (job_device, size) in self._reservations.items():
+            if job is exclude or job_device != device:
+                continue
+            total += max(0, size - (job.downloaded_bytes or 0))
+        return total
+
+    def reserve(self, job, path, size):
+        """job için size bayt ayırır, yer yoksa InsufficientDiskSpace fırlatır"""
+        directory = _existing_dir(path)
+        device = os.stat(directory).st_dev
+        with self._lock:
+            others = self._outstanding(device, exclude=job)
+            available = shutil.disk_usage(directory).free - others - self.margin
+            needed = max(0, (size or 0) - (job.downloaded_bytes or 0))
+            if needed > available:
+                raise InsufficientDiskSpace(needed, available, waiting=others > 0)
+            self._reservations[job] = (device, size or 0)
+
+    def release(self, job):
+        """İşin ayırdığı alanı serbest bırakır"""
+        with self._lock:
+            self._reservations.pop(job, None)
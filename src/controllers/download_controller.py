@@ -1,44 +1,168 @@
 import os
-from src.models.download import Download
+from src.database.write_behind import WriteBehindQueue
+from src.models.download import Download, COLUMNS
+from src.utils.file_utils import normalize_path
+
+DEFAULT_PAGE_SIZE = 100
+# Geçmiş listesinin ihtiyaç duyduğu sütunlar
+LIST_COLUMNS = ('id', 'title', 'file_path', 'file_type', 'download_date', 'video_id',
+                'file_name', 'file_size')
 
 class DownloadController:
-    def __init__(self, db):
+    """İndirme geçmişi kayıtlarını yönetir.
+
+    Yazımlar writer üzerinden toplu yapılır; ekleme ve silme metotları
+    yazımı kuyruğa alıp döner. Dinleyiciler (event, download)
+    parametreleriyle yazım kalıcı olduktan sonra yazıcı thread'inden
+    çağrılır. Olaylar: 'inserted', 'deleted' ve yazım yapılamadığında ya
+    da silinecek kayıt bulunamadığında 'failed'. 'deleted' ve
+    'failed' olaylarındaki Download yalnızca id (eklemede None) ve user_id
+    taşır.
+    """
+
+    def __init__(self, db, writer=None):
         self.db = db
+        self.writer = writer or WriteBehindQueue(db, flush_interval=0)
+        self.listeners = []
+
+    def add_listener(self, callback):
+        """Geçmiş değişikliklerini dinleyecek fonksiyonu ekler"""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Dinleyiciyi kaldırır"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def _notify(self, event, download):
+        for listener in list(self.listeners):
+            try:
+                listener(event, download)
+            except Exception as e:
+                print(f"Geçmiş dinleyici hatası: {e}")
 
-    def add_download(self, user_id, title, url, file_path, file_type):
-        """Yeni indirme kaydı ekler"""
+    def add_download(self, user_id, title, url, file_path, file_type, video_id=None,
+                     file_name=None, file_size=None, duration=None):
+        """Yeni indirme kaydını yazım kuyruğuna ekler"""
+        if file_path:
+            # Mükerrer kontrolü aynı klasörü farklı yazımlarla kaçırmasın
+            file_path = os.path.realpath(file_path)
+        self.writer.submit('''
+            INSERT INTO downloads (user_id, title, url, file_path, file_type, video_id,
+                                   file_name, file_size, duration)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (user_id, title, url, file_path, file_type, video_id, file_name,
+              file_size, duration),
+            on_commit=lambda cursor: self._notify_changed('inserted', cursor.lastrowid),
+            on_error=lambda error: self._notify_failed(None, user_id))
+        return True
+
+    def _notify_failed(self, download_id, user_id):
+        self._notify('failed', Download(id=download_id, user_id=user_id))
+
+    def _notify_changed(self, event, download_id):
+        download = self.get_download(download_id)
+        if download:
+            self._notify(event, download)
+
+    def get_download(self, download_id):
+        """Tek bir indirme kaydını döndürür"""
         try:
-            cursor = self.db.conn.cursor()
-            cursor.execute('''
-                INSERT INTO downloads (user_id, title, url, file_path, file_type)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (user_id, title, url, file_path, file_type))
-            self.db.conn.commit()
-            return True
+            row = self.db.conn.execute('SELECT * FROM downloads WHERE id = ?',
+                                       (download_id,)).fetchone()
+            return Download.from_db_row(row) if row else None
         except Exception as e:
-            print(f"İndirme kayıt hatası: {e}")
-            return False
+            print(f"İndirme okuma hatası: {e}")
+            return None
+
+    def add_job_download(self, job):
+        """Tamamlanan kuyruk işini indirme geçmişine kaydeder"""
+        title = job.info.get('title', 'Bilinmeyen') if job.info else 'Bilinmeyen'
+        video_id = job.video_id or (job.info.get('id') if job.info else None)
+        file_name = os.path.basename(job.output_path) if job.output_path else None
+        duration = job.info.get('duration') if job.info else None
+
+        return self.add_download(
+            job.user_id,
+            title,
+            job.url,
+            job.download_path,
+            job.file_type,
+            video_id,
+            file_name,
+            job.file_size,
+            duration
+        )
+
+    def get_user_downloads_page(self, user_id, limit=DEFAULT_PAGE_SIZE, cursor=None,
+                                columns=LIST_COLUMNS):
+        """Kullanıcının indirmelerini yeniden eskiye sayfa sayfa getirir.
+
+        (indirmeler, sonraki_imleç) döndürür; imleç bir sonraki çağrıya
+        olduğu gibi verilir, son sayfada None olur. Sayfalama OFFSET yerine
+        son satırın (download_date, id) değeriyle yapıldığı için derin
+        sayfalar da idx_downloads_user_date üzerinden hızlı okunur.
+        """
+        selected = [column for column in COLUMNS
+                    if column in columns or column in ('id', 'download_date')]
+        query = f"SELECT {', '.join(selected)} FROM downloads WHERE user_id = ?"
+        params = [user_id]
+        if cursor is not None:
+            query += ' AND (download_date, id) < (?, ?)'
+            params.extend(cursor)
+        query += ' ORDER BY download_date DESC, id DESC LIMIT ?'
+        params.append(limit)
 
-    def get_user_downloads(self, user_id):
-        """Kullanıcının indirmelerini listeler"""
         try:
-            cursor = self.db.conn.cursor()
-            cursor.execute('SELECT * FROM downloads WHERE user_id = ? ORDER BY download_date DESC', (user_id,))
-            return [Download.from_db_row(row) for row in cursor.fetchall()]
+            rows = self.db.conn.execute(query, params).fetchall()
         except Exception as e:
             print(f"İndirme listesi hatası: {e}")
-            return []
+            return [], None
 
-    def delete_download(self, download_id, user_id):
-        """İndirme kaydını siler"""
+        downloads = [Download.from_db_row(row) for row in rows]
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = (rows[-1]['download_date'], rows[-1]['id'])
+        return downloads, next_cursor
+
+    def find_existing_download(self, video_id, file_type, file_path):
+        """Aynı video, format ve klasör için diskte duran indirmeyi döndürür.
+
+        Klasörler normalize edilerek karşılaştırılır; 'C:/x' ile 'C:/x/' ya da
+        göreli ve mutlak yol aynı klasör sayılır.
+        """
+        folder = normalize_path(file_path)
         try:
             cursor = self.db.conn.cursor()
-            cursor.execute('DELETE FROM downloads WHERE id = ? AND user_id = ?', (download_id, user_id))
-            self.db.conn.commit()
-            return cursor.rowcount > 0
+            cursor.execute('''
+                SELECT * FROM downloads
+                WHERE video_id = ? AND file_type = ?
+                ORDER BY id DESC
+            ''', (video_id, file_type))
+            for row in cursor.fetchall():
+                download = Download.from_db_row(row)
+                if not download.file_path or normalize_path(download.file_path) != folder:
+                    continue
+                if download.full_path and os.path.exists(download.full_path):
+                    return download
+            return None
         except Exception as e:
-            print(f"İndirme silme hatası: {e}")
-            return False
+            print(f"Mükerrer indirme kontrol hatası: {e}")
+            return None
+
+    def delete_download(self, download_id, user_id):
+        """İndirme kaydını silmek üzere kuyruğa alır; sonuç 'deleted' ya da
+        'failed' olayıyla bildirilir"""
+        def on_commit(cursor):
+            if cursor.rowcount > 0:
+                self._notify('deleted', Download(id=download_id, user_id=user_id))
+            else:
+                self._notify_failed(download_id, user_id)
+
+        self.writer.submit('DELETE FROM downloads WHERE id = ? AND user_id = ?',
+                           (download_id, user_id), on_commit=on_commit,
+                           on_error=lambda error: self._notify_failed(download_id, user_id))
+        return True
 
     def get_download_stats(self, user_id):
         """Kullanıcının indirme istatistiklerini getirir"""
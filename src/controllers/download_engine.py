@@ -0,0 +1,43 @@
+from src.controllers.bandwidth_governor import BandwidthGovernor
+from src.controllers.disk_space_guard import DiskSpaceGuard
+from src.controllers.download_queue import DownloadQueue, DEFAULT_MAX_WORKERS
+from src.controllers.postprocessing import PostProcessingPool
+from src.controllers.retry_policy import RetryPolicy, CircuitBreaker
+from src.database.job_journal import JobJournal
+from src.database.metadata_cache import MetadataCache
+from src.utils.thumbnail_store import ThumbnailStore
+
+class DownloadEngine:
+    """İndirme kuyruğunu önbellek, iş günlüğü, hız sınırlayıcı ve işlem
+    havuzuyla birlikte kurar; arayüz, komut satırı ve daemon aynı
+    yapıyı kullanır"""
+
+    def __init__(self, db, download_controller, max_workers=DEFAULT_MAX_WORKERS,
+                 rate_limit=None, preallocate=False, writer=None, keep_finished=None):
+        self.metadata_cache = MetadataCache(db)
+        self.journal = JobJournal(db, writer)
+        self.governor = BandwidthGovernor(rate_limit)
+        self.postprocessing = PostProcessingPool()
+        self.retry_policy = RetryPolicy()
+        self.circuit_breaker = CircuitBreaker()
+        self.disk_guard = DiskSpaceGuard(preallocate=preallocate)
+        self.thumbnail_store = ThumbnailStore()
+        self.queue = DownloadQueue(
+            max_workers=max_workers,
+            metadata_cache=self.metadata_cache,
+            journal=self.journal,
+            governor=self.governor,
+            postprocessing=self.postprocessing,
+            duplicate_checker=download_controller.find_existing_download,
+            retry_policy=self.retry_policy,
+            circuit_breaker=self.circuit_breaker,
+            disk_guard=self.disk_guard,
+            thumbnail_store=self.thumbnail_store,
+            keep_finished=keep_finished
+        )
+
+    def shutdown(self, wait=False):
+        """İşçileri ve işlem havuzunu durdurur"""
+        self.queue.shutdown(wait=wait)
+        self.journal.close()
+        self.postprocessing.shutdown(wait=wait)
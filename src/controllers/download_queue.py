@@ -0,0 +1,494 @@
+import itertools
+import os
+import queue
+import threading
+import time
+from src.controllers.disk_space_guard import InsufficientDiskSpace
+from src.controllers.download_task import (DownloadTask, JobCancelled, JobPaused,
+                                           JobPreempted, iter_collection_entries)
+from src.controllers.retry_policy import THROTTLED, host_of
+from src.utils.progress import DEFAULT_MAX_RATE
+from src.utils.validators import extract_video_id
+from src.models.download_job import DownloadJob
+
+DEFAULT_MAX_WORKERS = 3
+DISK_WAIT_DELAY = 30.0
+# Komut satırı ve daemon'da listede tutulan en fazla bitmiş iş sayısı
+DEFAULT_KEEP_FINISHED = 200
+# Oynatma listesi keşfi, bekleyen iş sayısı işçi başına bu kadarı aşınca durur
+DISCOVERY_BACKLOG_PER_WORKER = 4
+DISCOVERY_POLL_INTERVAL = 0.5
+
+class DownloadQueue:
+    """İndirme işlerini sabit sayıda yeniden kullanılan işçiyle çalıştırır.
+
+    Dinleyiciler (event, job) parametreleriyle işçi thread'inden çağrılır.
+    Olaylar: 'added', 'started', 'info', 'progress', 'processing', 'preempted',
+    'retrying', 'paused', 'resumed', 'finished'. 'processing' olayından sonraki 'finished' işlem
+    havuzunun thread'inden gelir.
+
+    Tüm işçiler doluyken daha yüksek öncelikli bir iş gelirse en düşük
+    öncelikli çalışan iş progress_hook içinde durdurulur, kuyruğa geri
+    döner ve sırası gelince continuedl ile kaldığı yerden sürer.
+
+    retry_policy verilirse geçici hatalar beklemeli olarak yeniden denenir;
+    circuit_breaker 429/403 döndüren sunucudaki işleri devre kapanana kadar
+    bekletir. disk_guard verilirse iş, tahmini boyutu kadar boş alan
+    ayrılamadan başlamaz; aynı diske yazan işler sürüyorsa onları bekler.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, metadata_cache=None, journal=None,
+                 progress_rate=DEFAULT_MAX_RATE, governor=None, postprocessing=None,
+                 duplicate_checker=None, retry_policy=None, circuit_breaker=None,
+                 disk_guard=None, thumbnail_store=None, keep_finished=None):
+        self.max_workers = max(1, int(max_workers))
+        self.keep_finished = keep_finished
+        self.progress_rate = progress_rate
+        self.governor = governor
+        self.postprocessing = postprocessing
+        self.metadata_cache = metadata_cache
+        self.journal = journal
+        self.duplicate_checker = duplicate_checker
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.disk_guard = disk_guard
+        self.thumbnail_store = thumbnail_store
+        self.jobs = {}
+        self._active_keys = {}
+        self.listeners = []
+        self._pending = queue.PriorityQueue()
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._workers = []
+        self._stopped = threading.Event()
+
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop,
+                                      name=f'download-worker-{i + 1}',
+                                      daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def add_listener(self, callback):
+        """İş olaylarını dinleyecek fonksiyonu ekler"""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Dinleyiciyi kaldırır"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def _notify(self, event, job):
+        for listener in list(self.listeners):
+            try:
+                listener(event, job)
+            except Exception as e:
+                print(f"Kuyruk dinleyici hatası: {e}")
+
+    def submit(self, url, download_path, format_id='best', user_id=None, journal_id=None,
+               connections=1, priority=0, stream_audio=False):
+        """Yeni indirme işini kuyruğa ekler ve işi döndürür.
+
+        stream_audio açıksa ses indirmeleri ara dosya yazmadan doğrudan
+        MP3'e dönüştürülür.
+
+        journal_id verilirse yarım kalmış günlük kaydı sürdürülür. Aynı
+        video aynı format ve klasöre zaten indirilmişse ya da kuyrukta
+        bekliyorsa iş ağa çıkmadan 'skipped' olarak sonlanır.
+        """
+        with self._lock:
+            job = DownloadJob(next(self._ids), url, download_path, format_id, user_id,
+                              connections, priority, stream_audio)
+            job.video_id = extract_video_id(url)
+            self.jobs[job.id] = job
+            key = job.duplicate_key()
+            duplicate = key is not None and key in self._active_keys
+            if duplicate:
+                holder = self.jobs.get(self._active_keys[key])
+                job.duplicate_of = self._active_keys[key]
+                if holder is not None and holder.state == DownloadJob.PAUSED:
+                    job.error = 'Aynı video kuyrukta duraklatılmış olarak bekliyor'
+                else:
+                    job.error = 'Aynı video zaten kuyrukta'
+            elif key is not None:
+                self._active_keys[key] = job.id
+
+        if not duplicate and key is not None and self.duplicate_checker:
+            existing = self.duplicate_checker(job.video_id, job.file_type, download_path)
+            if existing:
+                duplicate = True
+                job.output_path = os.path.join(download_path, existing.file_name)
+                self._release_key(job)
+
+        if duplicate:
+            job.state = DownloadJob.SKIPPED
+            job.progress = 100.0
+            if self.journal and journal_id is not None:
+                self.journal.set_state(journal_id, job.state)
+            self._notify('added', job)
+            self._notify('finished', job)
+            self._evict_finished()
+            return job
+
+        if self.journal:
+            if journal_id is None:
+                journal_id = self.journal.create(job)
+            else:
+                self.journal.set_state(journal_id, job.state)
+        job.journal_id = journal_id
+
+        self._notify('added', job)
+        self._enqueue(job)
+        self._preempt_for(job)
+        return job
+
+    def submit_journaled(self, entry):
+        """İş günlüğünden devralınan kaydı aynı seçeneklerle yeniden kuyruğa ekler"""
+        return self.submit(
+            entry['url'],
+            entry['download_path'],
+            entry['format_id'],
+            entry['user_id'],
+            journal_id=entry['id'],
+            connections=entry.get('connections') or 1,
+            priority=entry.get('priority') or 0,
+            stream_audio=bool(entry.get('stream_audio'))
+        )
+
+    def _preempt_for(self, job):
+        # Boş işçi varsa ya da iş daha öncelikli değilse kimse durdurulmaz
+        with self._lock:
+            running = [j for j in self.jobs.values() if j.state == DownloadJob.RUNNING]
+            if len(running) < self.max_workers:
+                return
+            queued_ahead = [j for j in self.jobs.values()
+                            if j.state == DownloadJob.QUEUED and not j.retry_at
+                            and j.priority >= job.priority]
+            stopping = [j for j in running if j.preempt_requested
+                        or j.cancel_requested or j.pause_requested]
+            # Sürdürülemeyen iş durdurulursa baştan inmesi gerekir
+            candidates = [j for j in running if j.resumable and j not in stopping]
+            preempting = len(stopping)
+            if not candidates or preempting >= len(queued_ahead):
+                return
+            victim = min(candidates, key=lambda j: (j.priority, -j.id))
+            if victim.priority < job.priority:
+                victim.preempt_requested = True
+
+    def _enqueue(self, job):
+        # Öncelik değişince iş yeni sırayla tekrar eklenir, eski kayıt atlanır
+        with self._lock:
+            job.queue_seq = next(self._seq)
+            self._pending.put((-job.priority, job.queue_seq, job))
+
+    def set_priority(self, job_id, priority):
+        """Bekleyen işin önceliğini değiştirir, büyük değer önce çalışır"""
+        job = self.jobs.get(job_id)
+        if not job or job.is_finished():
+            return False
+        job.priority = priority
+        if self.journal:
+            self.journal.set_priority(job.journal_id, priority)
+        # Yeniden deneme bekleyen iş süresi dolunca yeni öncelikle eklenir
+        if job.state == DownloadJob.QUEUED and not job.retry_at:
+            self._enqueue(job)
+            self._preempt_for(job)
+        return True
+
+    def cancel(self, job_id):
+        """İşi iptal eder; çalışan iş progress_hook içinde durdurulur"""
+        job = self.jobs.get(job_id)
+        if not job or job.is_finished() or job.state == DownloadJob.PROCESSING:
+            return False
+
+        with self._lock:
+            queued = job.state in (DownloadJob.QUEUED, DownloadJob.PAUSED)
+            if queued:
+                job.state = DownloadJob.CANCELLED
+            else:
+                job.cancel_requested = True
+
+        if queued:
+            self._set_state(job, DownloadJob.CANCELLED)
+            self._release_key(job)
+            self._notify('finished', job)
+        return True
+
+    def pause(self, job_id):
+        """İşi duraklatır; çalışan iş progress_hook içinde durdurulur ve
+        .part dosyası resume ile kaldığı yerden sürdürülmek üzere korunur.
+        Sürdürülemeyen (ses akışı) çalışan iş duraklatılamaz, False döner."""
+        job = self.jobs.get(job_id)
+        if not job:
+            return False
+
+        with self._lock:
+            if job.state == DownloadJob.QUEUED:
+                # Kuyruktaki eski kayıt işçi tarafından atlanır
+                job.state = DownloadJob.PAUSED
+                paused = True
+            elif job.state == DownloadJob.RUNNING and job.resumable:
+                job.pause_requested = True
+                paused = False
+            else:
+                return False
+
+        if paused:
+            self._set_state(job, DownloadJob.PAUSED)
+            self._notify('paused', job)
+        return True
+
+    def resume(self, job_id):
+        """Duraklatılan işi tekrar kuyruğa ekler"""
+        job = self.jobs.get(job_id)
+        if not job:
+            return False
+
+        with self._lock:
+            if job.state == DownloadJob.RUNNING and job.pause_requested:
+                # Henüz durmamış işin duraklatma isteği geri alınır
+                job.pause_requested = False
+                return True
+            if job.state != DownloadJob.PAUSED:
+                return False
+            job.state = DownloadJob.QUEUED
+            job.pause_requested = False
+            job.retry_at = None
+
+        self._set_state(job, DownloadJob.QUEUED)
+        self._notify('resumed', job)
+        self._enqueue(job)
+        self._preempt_for(job)
+        return True
+
+    def submit_collection(self, url, download_path, format_id='best', user_id=None,
+                          connections=1, priority=0, stream_audio=False):
+        """Oynatma listesi veya kanaldaki videoları keşfedildikçe kuyruğa ekler"""
+        thread = threading.Thread(
+            target=self._discover,
+            args=(url, download_path, format_id, user_id, connections, priority, stream_audio),
+            name='playlist-discovery',
+            daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _discover(self, url, download_path, format_id, user_id, connections, priority,
+                  stream_audio):
+        # Binlerce videoluk kanal, iş ve günlük kaydı yığmadan yavaş yavaş eklenir
+        backlog = self.max_workers * DISCOVERY_BACKLOG_PER_WORKER
+        try:
+            for entry_url in iter_collection_entries(url):
+                while (self.queued_count() >= backlog
+                       and not self._stopped.wait(DISCOVERY_POLL_INTERVAL)):
+                    pass
+                if self._stopped.is_set():
+                    break
+                self.submit(entry_url, download_path, format_id, user_id,
+                            connections=connections, priority=priority,
+                            stream_audio=stream_audio)
+        except Exception as e:
+            print(f"Oynatma listesi okuma hatası: {e}")
+
+    def _release_key(self, job):
+        with self._lock:
+            key = job.duplicate_key()
+            if self._active_keys.get(key) == job.id:
+                del self._active_keys[key]
+
+    def get_job(self, job_id):
+        """Kimliği verilen işi döndürür"""
+        return self.jobs.get(job_id)
+
+    def queued_count(self):
+        """Çalışmayı bekleyen iş sayısını döndürür"""
+        return sum(1 for job in list(self.jobs.values()) if job.state == DownloadJob.QUEUED)
+
+    def active_jobs(self):
+        """Sonlanmamış işleri listeler"""
+        return [job for job in list(self.jobs.values()) if not job.is_finished()]
+
+    def clear_finished(self):
+        """Tamamlanan ve başarısız olan işleri listeden çıkarır"""
+        with self._lock:
+            finished = [job_id for job_id, job in self.jobs.items() if job.is_finished()]
+            for job_id in finished:
+                del self.jobs[job_id]
+        return finished
+
+    def shutdown(self, wait=False):
+        """İşçileri durdurur, bekleyen işler çalıştırılmaz"""
+        self._stopped.set()
+        for _ in self._workers:
+            self._pending.put((float('-inf'), next(self._seq), None))
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _worker_loop(self):
+        while True:
+            _, seq, job = self._pending.get()
+            if job is None:
+                break
+            try:
+                with self._lock:
+                    # İptal edilmiş ya da önceliği değişmiş işin eski kaydı
+                    if job.state != DownloadJob.QUEUED or seq != job.queue_seq:
+                        continue
+                    job.state = DownloadJob.RUNNING
+                self._run_job(job)
+            finally:
+                self._pending.task_done()
+
+    def _set_state(self, job, state):
+        job.state = state
+        if self.journal:
+            self.journal.set_state(job.journal_id, state)
+
+    def _wait_and_retry(self, job, delay):
+        job.retry_at = time.time() + delay
+        timer = threading.Timer(delay, self._retry, args=(job,))
+        timer.daemon = True
+        timer.start()
+        self._notify('retrying', job)
+
+    def _retry(self, job):
+        with self._lock:
+            # Beklerken iptal edilmiş olabilir
+            if self._stopped.is_set() or job.state != DownloadJob.QUEUED:
+                return
+            job.retry_at = None
+        self._enqueue(job)
+
+    def _schedule_retry(self, job, error):
+        """Hata yeniden denenecekse işi bekletip True döndürür"""
+        if not self.retry_policy:
+            return False
+
+        kind = self.retry_policy.classify(error)
+        if self.circuit_breaker:
+            host = host_of(job.url)
+            if kind == THROTTLED:
+                self.circuit_breaker.record_failure(host)
+
+        job.attempts += 1
+        if self._stopped.is_set() or not self.retry_policy.should_retry(kind, job.attempts):
+            return False
+
+        self._set_state(job, DownloadJob.QUEUED)
+        self._wait_and_retry(job, self.retry_policy.delay(job.attempts))
+        return True
+
+    def _complete(self, job):
+        # Boyut bir kez burada okunur, geçmiş listesi diske bakmaz
+        if job.output_path:
+            try:
+                job.file_size = os.path.getsize(job.output_path)
+            except OSError:
+                job.file_size = None
+        self._set_state(job, DownloadJob.COMPLETED)
+
+    def _run_job(self, job):
+        host = host_of(job.url)
+        if self.circuit_breaker:
+            wait = self.circuit_breaker.blocked_for(host)
+            if wait:
+                # Sunucu bizi sınırlıyor; deneme hakkı harcamadan beklenir
+                job.state = DownloadJob.QUEUED
+                job.error = 'Sunucu istekleri sınırladı, bekleniyor'
+                self._wait_and_retry(job, wait)
+                return
+
+        self._set_state(job, DownloadJob.RUNNING)
+        self._notify('started', job)
+
+        task = DownloadTask(
+            job,
+            on_progress=lambda j: self._notify('progress', j),
+            on_info=lambda j: self._notify('info', j),
+            metadata_cache=self.metadata_cache,
+            journal=self.journal,
+            progress_rate=self.progress_rate,
+            governor=self.governor,
+            postprocessing=self.postprocessing,
+            disk_guard=self.disk_guard,
+            thumbnail_store=self.thumbnail_store
+        )
+        try:
+            task.run()
+            if self.circuit_breaker:
+                self.circuit_breaker.record_success(host)
+            job.error = ''
+            job.progress = 100.0
+            if task.pending:
+                # İşçi ffmpeg'i beklemeden sıradaki işe geçer
+                self._set_state(job, DownloadJob.PROCESSING)
+                self._notify('processing', job)
+                task.pending.add_done_callback(lambda future: self._finish_processing(job, future))
+                return
+            self._complete(job)
+        except JobPreempted:
+            # Kısmi dosya yerinde kalır, iş aynı öncelikle kuyruğa döner
+            job.preempt_requested = False
+            self._set_state(job, DownloadJob.QUEUED)
+            self._notify('preempted', job)
+            self._enqueue(job)
+            return
+        except JobPaused:
+            job.pause_requested = False
+            self._set_state(job, DownloadJob.PAUSED)
+            self._notify('paused', job)
+            return
+        except JobCancelled:
+            self._set_state(job, DownloadJob.CANCELLED)
+        except InsufficientDiskSpace as e:
+            job.error = str(e)
+            if e.waiting:
+                # Aynı diske yazan işler bitince yer açılabilir
+                self._set_state(job, DownloadJob.QUEUED)
+                self._wait_and_retry(job, DISK_WAIT_DELAY)
+                return
+            self._set_state(job, DownloadJob.FAILED)
+        except Exception as e:
+            job.error = str(e)
+            if self._schedule_retry(job, e):
+                return
+            self._set_state(job, DownloadJob.FAILED)
+        finally:
+            # Tam bilgi yalnızca indirme sürerken gerekir; tekrar denemede yeniden okunur
+            job.trim_info()
+            if self.circuit_breaker:
+                # Yarı açık devrenin deneme hakkı hangi yoldan çıkılırsa çıkılsın bırakılır;
+                # başarı ve sınırlandırma devrenin durumunu zaten güncellemiştir
+                self.circuit_breaker.abort_probe(host)
+            if self.governor:
+                self.governor.release(job.id)
+            # Dönüştürme süren işin ayırdığı alan işlem bitince bırakılır
+            if self.disk_guard and job.state != DownloadJob.PROCESSING:
+                self.disk_guard.release(job)
+        self._release_key(job)
+        self._notify('finished', job)
+        self._evict_finished()
+
+    def _finish_processing(self, job, future):
+        try:
+            job.output_path = future.result()
+            self._complete(job)
+        except Exception as e:
+            job.error = str(e)
+            self._set_state(job, DownloadJob.FAILED)
+        if self.disk_guard:
+            self.disk_guard.release(job)
+        self._release_key(job)
+        self._notify('finished', job)
+        self._evict_finished()
+
+    def _evict_finished(self):
+        # Arayüz bitmiş işleri clear_finished ile temizler, diğerleri burada sınırlanır
+        if self.keep_finished is None:
+            return
+        with self._lock:
+            finished = [job_id for job_id, job in self.jobs.items() if job.is_finished()]
+            for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+                del self.jobs[job_id]
@@ -0,0 +1,437 @@
+import copy
+import glob
+import os
+import time
+import yt_dlp
+from src.controllers.disk_space_guard import InsufficientDiskSpace, estimate_size
+from src.controllers.postprocessing import stream_audio
+from src.utils.progress import ProgressCoalescer, DEFAULT_MAX_RATE
+from src.utils.ranged_download import ranged_download, remove_partial
+from src.utils.file_utils import ensure_dir
+from src.utils.validators import extract_video_id
+
+JOURNAL_INTERVAL = 2.0
+
+class JobCancelled(yt_dlp.utils.DownloadCancelled):
+    """İş, progress_hook içinde iptal edildiğinde fırlatılır.
+
+    yt-dlp DownloadCancelled türündeki hataları sarmalamadan ilettiği için
+    indirme döngüsü temiz bir şekilde sonlanır; yarım kalan dosyalar silinir.
+    """
+    msg = 'İndirme iptal edildi'
+
+class JobPaused(yt_dlp.utils.DownloadCancelled):
+    """Kullanıcı işi duraklattığında fırlatılır, .part dosyası korunur"""
+    msg = 'İndirme duraklatıldı'
+
+class JobPreempted(yt_dlp.utils.DownloadCancelled):
+    """Daha yüksek öncelikli iş için yer açılırken fırlatılır"""
+    msg = 'İndirme daha öncelikli bir iş için durduruldu'
+
+class DownloadTask:
+    """Tek bir indirme işini yt-dlp ile çalıştırır"""
+
+    def __init__(self, job, on_progress=None, on_info=None, metadata_cache=None,
+                 journal=None, progress_rate=DEFAULT_MAX_RATE, governor=None,
+                 postprocessing=None, disk_guard=None, thumbnail_store=None):
+        self.job = job
+        self.on_progress = on_progress
+        self.on_info = on_info
+        self.metadata_cache = metadata_cache
+        self.journal = journal
+        self.last_journal_write = 0
+        self.coalescer = ProgressCoalescer(progress_rate)
+        self.governor = governor
+        self.throttled_file = None
+        self.throttled_bytes = 0
+        self.postprocessing = postprocessing
+        self.disk_guard = disk_guard
+        self.thumbnail_store = thumbnail_store
+        self.pending = None
+        self.partial_files = set()
+
+    def progress_hook(self, d):
+        if d.get('tmpfilename') and d.get('tmpfilename') != d.get('filename'):
+            self.partial_files.add(d['tmpfilename'])
+        self.check_cancelled()
+        self.write_journal(d)
+        snapshot = self.coalescer.update(d)
+        if snapshot:
+            self.report_progress(snapshot)
+
+    def check_cancelled(self):
+        """İptal, duraklatma ya da öncelik nedeniyle durdurma istenmişse
+        indirmeyi sonlandırır"""
+        if self.job.cancel_requested:
+            raise JobCancelled()
+        if self.job.pause_requested:
+            raise JobPaused()
+        if self.job.preempt_requested:
+            raise JobPreempted()
+
+    def throttle_hook(self, d):
+        """Yeni inen baytlar için ortak hız sınırlayıcıdan izin bekler.
+
+        yt-dlp sürdürülen indirmelerde downloaded_bytes'a diskteki .part
+        boyutunu da kattığı için bir dosyanın ilk bildirimi yalnızca
+        başlangıç noktası olarak alınır, ondan sonraki artışlar ödenir.
+        """
+        if d['status'] != 'downloading':
+            return
+        filename = d.get('filename')
+        downloaded = d.get('downloaded_bytes') or 0
+        if filename != self.throttled_file or downloaded < self.throttled_bytes:
+            self.throttled_file = filename
+            self.throttled_bytes = downloaded
+            return
+        self.throttle(downloaded - self.throttled_bytes)
+        self.throttled_bytes = downloaded
+
+    def throttle(self, amount):
+        """amount bayt için ortak hız sınırlayıcıdan izin bekler"""
+        if self.governor:
+            self.governor.consume(self.job.id, amount)
+
+    def write_journal(self, d):
+        """İndirilen bayt sayısını belirli aralıklarla günlüğe yazar"""
+        if not self.journal:
+            return
+        now = time.monotonic()
+        if d['status'] == 'downloading' and now - self.last_journal_write < JOURNAL_INTERVAL:
+            return
+        self.last_journal_write = now
+        self.journal.update_progress(
+            self.job.journal_id,
+            d.get('filename'),
+            d.get('downloaded_bytes', 0),
+            d.get('total_bytes') or d.get('total_bytes_estimate')
+        )
+
+    def report_progress(self, snapshot):
+        """İlerlemeyi işe yazar ve dinleyiciye bildirir"""
+        self.job.progress = snapshot['percent']
+        self.job.downloaded_bytes = snapshot['downloaded_bytes']
+        self.job.total_bytes = snapshot['total_bytes']
+        self.job.speed = snapshot['speed']
+        self.job.eta = snapshot['eta']
+        if self.on_progress:
+            self.on_progress(self.job)
+
+    def build_options(self):
+        """yt-dlp seçeneklerini oluşturur"""
+        ydl_opts = {
+            'format': self.job.format_id,
+            'outtmpl': os.path.join(self.job.download_path, '%(title)s.%(ext)s'),
+            'progress_hooks': [self.progress_hook, self.throttle_hook],
+            'quiet': True,
+            # İlerleme hook'larla bildirilir; yt-dlp'nin çubuğu cli.py'nin JSON çıktısını bozar
+            'noprogress': True,
+            'no_warnings': True,
+            'extract_flat': False,
+            'continuedl': True,
+            'nocheckcertificate': True,
+            'no_color': True,
+            'geo_bypass': True,
+            'cookies': None,
+            'http_headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            }
+        }
+
+        if self.job.format_id == 'bestaudio/best':
+            ydl_opts.update({
+                # Akış modunda ffmpeg'e aktarılabilecek tek dosyalık HTTP formatı tercih edilir
+                'format': ('bestaudio[protocol^=http]/bestaudio/best' if self.job.stream_audio
+                           else 'bestaudio/best'),
+            })
+            # Havuz yoksa dönüştürme eskisi gibi indirme işçisinde yapılır
+            if not self.postprocessing:
+                ydl_opts['postprocessors'] = [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': 'mp3',
+                    'preferredquality': '192',
+                }]
+        elif self.job.connections > 1:
+            # Çoklu bağlantı yalnızca tek dosyalık (progresif) formatlarda işe yarar
+            ydl_opts.update({
+                'format': 'best[ext=mp4][protocol^=http]/best[protocol^=http]/best',
+            })
+        else:
+            ydl_opts.update({
+                'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
+            })
+
+        return ydl_opts
+
+    def extract_info(self, ydl, use_cache=True):
+        """Video bilgisini önbellekten ya da yt-dlp ile bir kez çıkarır"""
+        video_id = extract_video_id(self.job.url)
+        if use_cache and self.metadata_cache:
+            info = self.metadata_cache.get(video_id)
+            if info:
+                return info, True
+
+        info = ydl.extract_info(self.job.url, download=False, process=False)
+        if info and self.metadata_cache and info.get('_type', 'video') == 'video':
+            self.metadata_cache.put(info.get('id') or video_id, ydl.sanitize_info(info))
+        return info, False
+
+    def run(self):
+        """İndirmeyi çalıştırır, başarısız olursa hata fırlatır"""
+        with yt_dlp.YoutubeDL(self.build_options()) as ydl:
+            # Sayfa yalnızca bir kez çözülür, indirme aynı sonucu kullanır
+            info, cached = self.extract_info(ydl)
+            if not info:
+                raise RuntimeError('Video bilgileri alınamadı')
+
+            self.job.info = info
+            if self.on_info:
+                self.on_info(self.job)
+            self.check_cancelled()
+
+            try:
+                result = self.download(ydl, info)
+            except JobCancelled:
+                self.remove_partial_files()
+                raise
+            except (JobPaused, JobPreempted, InsufficientDiskSpace):
+                raise
+            except Exception:
+                if not cached:
+                    raise
+                result = None
+
+            if not result and cached:
+                # Önbellekteki format URL'leri geçersizleşmiş olabilir
+                self.metadata_cache.invalidate(info.get('id'))
+                info, _ = self.extract_info(ydl, use_cache=False)
+                if not info:
+                    raise RuntimeError('Video bilgileri alınamadı')
+                result = self.download(ydl, info)
+
+            if not result:
+                raise RuntimeError('Video indirilemedi')
+            self.job.info = result
+            self.save_thumbnail(result)
+            return result
+
+    def remove_partial_files(self):
+        """İptal edilen işin yt-dlp .part, .ytdl ve parça dosyalarını siler"""
+        for path in self.partial_files:
+            for partial in [path, path + '.ytdl'] + glob.glob(glob.escape(path) + '-Frag*'):
+                try:
+                    os.remove(partial)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"Yarım dosya silme hatası: {e}")
+
+    def save_thumbnail(self, info):
+        """Geçmiş listesinde gösterilecek küçük resmi bir kez kaydeder"""
+        if not self.thumbnail_store:
+            return
+        try:
+            self.thumbnail_store.fetch(info.get('id') or self.job.video_id, info,
+                                       info.get('http_headers'))
+        except Exception as e:
+            print(f"Küçük resim kaydetme hatası: {e}")
+
+    def download(self, ydl, info):
+        """Çıkarılmış bilgiyle indirmeyi yapar, seçiliyse çoklu bağlantı kullanır"""
+        # Ayrı, aralıklı ve akışlı yollar yt-dlp'nin klasör oluşturmasından geçmez
+        ensure_dir(self.job.download_path)
+        if (self.job.connections > 1 or self.job.stream_audio or self.postprocessing
+                or self.disk_guard):
+            selected = ydl.process_ie_result(copy.deepcopy(info), download=False)
+            if selected:
+                self.reserve_space(selected)
+            if selected and self.streams_audio(selected):
+                return self.download_streaming(ydl, selected)
+            if selected and self.job.connections > 1 and is_progressive(selected):
+                return self.download_ranged(ydl, selected)
+            if selected and self.postprocessing and selected.get('requested_formats'):
+                return self.download_separate(ydl, selected)
+
+        result = ydl.process_ie_result(info, download=True)
+        if result:
+            self.finish(result, downloaded_path(ydl, result))
+        return result
+
+    def reserve_space(self, info):
+        """Seçilen formatların tahmini boyutu kadar yeri diskte ayırır"""
+        if not self.disk_guard:
+            return
+        size = estimate_size(info)
+        converted = self.job.file_type == 'audio' and not self.streams_audio(info)
+        if size and (info.get('requested_formats') or converted):
+            # Birleştirme ve dönüştürme bitene kadar kaynak ve hedef birlikte durur
+            size *= 2
+        self.disk_guard.reserve(self.job, self.job.download_path, size)
+
+    def streams_audio(self, info):
+        """Seçilen sesin ara dosya olmadan dönüştürülüp dönüştürülmeyeceğini döndürür"""
+        return self.job.stream_audio and self.job.file_type == 'audio' and is_progressive(info)
+
+    def finish(self, info, filename):
+        """Çıkış dosyasını belirler, ses dönüştürmeyi işlem havuzuna bırakır"""
+        if self.postprocessing and self.job.file_type == 'audio':
+            target = os.path.splitext(filename)[0] + '.mp3'
+            if target != filename:
+                self.pending = self.postprocessing.extract_audio(filename, target)
+                filename = target
+        self.job.output_path = filename
+        return info
+
+    def download_separate(self, ydl, info):
+        """Görüntü ve sesi ayrı indirir, birleştirmeyi işlem havuzuna bırakır"""
+        target = ydl.prepare_filename(info)
+        base = os.path.splitext(target)[0]
+        paths = []
+        for fmt in info['requested_formats']:
+            format_info = dict(info)
+            format_info.update(fmt)
+            format_info.pop('requested_formats', None)
+            filename = f"{base}.f{fmt['format_id']}.{fmt['ext']}"
+            success = ydl.dl(filename, format_info)
+            if isinstance(success, tuple):
+                success = success[0]
+            if not success:
+                raise RuntimeError('Video indirilemedi')
+            paths.append(filename)
+
+        self.pending = self.postprocessing.merge_streams(paths[0], paths[1], target)
+        self.job.output_path = target
+        return info
+
+    def download_ranged(self, ydl, info):
+        """Progresif formatı paralel bayt aralıklarıyla indirir.
+
+        Duraklatılan ya da kesilen indirme aynı dosya için tekrar
+        çağrıldığında kalan aralıklardan sürer; iptal edilirse yarım
+        dosya silinir.
+        """
+        filename = ydl.prepare_filename(info)
+        downloader_options = info.get('downloader_options') or {}
+
+        def on_chunk(downloaded, total):
+            self.progress_hook({
+                'status': 'downloading',
+                'filename': filename,
+                'downloaded_bytes': downloaded,
+                'total_bytes': total
+            })
+
+        try:
+            downloaded = ranged_download(
+                info['url'],
+                filename,
+                connections=self.job.connections,
+                headers=info.get('http_headers'),
+                progress_callback=on_chunk,
+                throttle=self.throttle,
+                verify=not ydl.params.get('nocheckcertificate'),
+                preallocate=bool(self.disk_guard and self.disk_guard.preallocate),
+                chunk_size=downloader_options.get('http_chunk_size')
+            )
+        except JobCancelled:
+            remove_partial(filename)
+            raise
+        self.progress_hook({
+            'status': 'finished',
+            'filename': filename,
+            'downloaded_bytes': downloaded,
+            'total_bytes': downloaded
+        })
+        if self.postprocessing:
+            return self.finish(info, filename)
+        info = ydl.post_process(filename, info)
+        self.job.output_path = info.get('filepath') or filename
+        return info
+
+    def download_streaming(self, ydl, info):
+        """Ses akışını indirirken ffmpeg'e aktarır, yalnızca MP3 dosyası yazılır"""
+        target = os.path.splitext(ydl.prepare_filename(info))[0] + '.mp3'
+
+        def on_chunk(downloaded, total):
+            self.progress_hook({
+                'status': 'downloading',
+                'filename': target,
+                'downloaded_bytes': downloaded,
+                'total_bytes': total or info.get('filesize') or info.get('filesize_approx')
+            })
+
+        downloaded = stream_audio(
+            info['url'],
+            target,
+            headers=info.get('http_headers'),
+            progress_callback=on_chunk,
+            throttle=self.throttle,
+            verify=not ydl.params.get('nocheckcertificate')
+        )
+        self.progress_hook({
+            'status': 'finished',
+            'filename': target,
+            'downloaded_bytes': downloaded,
+            'total_bytes': downloaded
+        })
+        self.job.output_path = target
+        return info
+
+def downloaded_path(ydl, info):
+    """yt-dlp'nin indirdiği son dosyanın yolunu döndürür"""
+    downloads = info.get('requested_downloads') or []
+    if downloads and downloads[0].get('filepath'):
+        return downloads[0]['filepath']
+    return info.get('filepath') or ydl.prepare_filename(info)
+
+def iter_collection_entries(url, max_depth=2):
+    """Oynatma listesi veya kanaldaki video URL'lerini keşfedildikçe üretir.
+
+    extract_flat ile yalnızca liste sayfaları çözülür, girişler bellekte
+    toplanmadan tek tek döndürülür. Kanal sekmeleri gibi iç içe listeler
+    max_depth seviyesine kadar açılır.
+    """
+    ydl_opts = {
+        'extract_flat': 'in_playlist',
+        'lazy_playlist': True,
+        'quiet': True,
+        'no_warnings': True,
+        'ignoreerrors': True,
+        'nocheckcertificate': True,
+        'no_color': True
+    }
+
+    def walk(ydl, collection_url, depth):
+        info = ydl.extract_info(collection_url, download=False, process=False)
+        if not info:
+            return
+        if info.get('_type') in ('url', 'url_transparent') and depth < max_depth:
+            # Kanal adresleri çoğunlukla videolar sekmesine yönlendirilir
+            yield from walk(ydl, info['url'], depth + 1)
+            return
+        if info.get('_type') not in ('playlist', 'multi_video'):
+            yield info.get('webpage_url') or collection_url
+            return
+
+        for entry in info.get('entries') or []:
+            if not entry:
+                continue
+            entry_url = entry.get('url') or entry.get('webpage_url')
+            if not entry_url and entry.get('id'):
+                entry_url = f"https://www.youtube.com/watch?v={entry['id']}"
+            if not entry_url:
+                continue
+            if entry.get('ie_key') == 'YoutubeTab' or entry.get('_type') == 'playlist':
+                if depth < max_depth:
+                    yield from walk(ydl, entry_url, depth + 1)
+            else:
+                yield entry_url
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        yield from walk(ydl, url, 0)
+
+def is_progressive(info):
+    """Seçilen formatın tek HTTP dosyası olup olmadığını döndürür"""
+    return (not info.get('requested_formats')
+            and info.get('protocol') in ('http', 'https')
+            and bool(info.get('url')))
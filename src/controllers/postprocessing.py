@@ -0,0 +1,115 @@
+import os
+import ssl
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.file_utils import ensure_dir
+from src.utils.ranged_download import CHUNK_SIZE, open_url
+
+FFMPEG = 'ffmpeg'
+
+def _run_ffmpeg(args):
+    result = subprocess.run([FFMPEG, '-y', '-loglevel', 'error'] + args,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg hatası: {result.stderr.strip()}")
+
+def extract_audio(source_path, target_path, quality='192'):
+    """Ses akışını MP3'e dönüştürür ve kaynak dosyayı siler"""
+    _run_ffmpeg(['-i', source_path, '-vn', '-codec:a', 'libmp3lame',
+                 '-b:a', f'{quality}k', target_path])
+    os.remove(source_path)
+    return target_path
+
+def merge_streams(video_path, audio_path, target_path):
+    """Ayrı indirilen görüntü ve ses akışlarını yeniden kodlamadan birleştirir"""
+    _run_ffmpeg(['-i', video_path, '-i', audio_path, '-map', '0:v:0', '-map', '1:a:0',
+                 '-c', 'copy', target_path])
+    os.remove(video_path)
+    os.remove(audio_path)
+    return target_path
+
+def stream_audio(url, target_path, headers=None, quality='192', progress_callback=None,
+                 throttle=None, verify=True):
+    """Ses akışını indirirken doğrudan ffmpeg'e aktarır, diske yalnızca MP3 yazılır.
+
+    Veri CHUNK_SIZE parçalarla okunur ve ffmpeg'in girdisine yazılır; ffmpeg
+    yetişemezse boru dolar ve okuma bekler, böylece bellek kullanımı
+    sınırlı kalır. İlerleme progress_callback(downloaded_bytes, total_bytes)
+    ile bildirilir. Hata ya da iptalde yarım MP3 silinir, akış kaldığı
+    yerden sürdürülemez. İndirilen bayt sayısını döndürür.
+    """
+    ssl_context = None if verify else ssl._create_unverified_context()
+    part_path = target_path + '.part'
+    # ffmpeg çıkış klasörünü kendisi oluşturmaz
+    ensure_dir(os.path.dirname(os.path.abspath(target_path)))
+    errors = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        [FFMPEG, '-y', '-loglevel', 'error', '-i', 'pipe:0', '-vn', '-codec:a', 'libmp3lame',
+         '-b:a', f'{quality}k', '-f', 'mp3', part_path],
+        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=errors
+    )
+    downloaded = 0
+    try:
+        with open_url(url, headers, ssl_context) as response:
+            length = response.headers.get('Content-Length')
+            total = int(length) if length else None
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if throttle:
+                    throttle(len(chunk))
+                try:
+                    process.stdin.write(chunk)
+                except BrokenPipeError:
+                    # ffmpeg erken çıktı, hata çıkış kodundan okunur
+                    break
+                downloaded += len(chunk)
+                if progress_callback:
+                    progress_callback(downloaded, total)
+
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        if process.wait() != 0:
+            errors.seek(0)
+            message = errors.read().decode('utf-8', 'replace').strip()
+            raise RuntimeError(f"ffmpeg hatası: {message}")
+        os.replace(part_path, target_path)
+        return downloaded
+    except BaseException:
+        process.kill()
+        process.wait()
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    finally:
+        errors.close()
+
+class PostProcessingPool:
+    """ffmpeg dönüştürme ve birleştirme işlerini indirme işçilerinden ayrı,
+    işlemci sayısı kadar thread'de çalıştırır.
+
+    Asıl iş ffmpeg'in kendi sürecinde yapıldığı için thread'ler yalnızca
+    onu bekler; çok thread'li süreçten fork edilen süreç havuzunun kilit
+    sorunları da böylece ortaya çıkmaz.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                           thread_name_prefix='postprocessing')
+
+    def extract_audio(self, source_path, target_path, quality='192'):
+        """Ses dönüştürme işini kuyruğa ekler ve Future döndürür"""
+        return self.executor.submit(extract_audio, source_path, target_path, quality)
+
+    def merge_streams(self, video_path, audio_path, target_path):
+        """Birleştirme işini kuyruğa ekler ve Future döndürür"""
+        return self.executor.submit(merge_streams, video_path, audio_path, target_path)
+
+    def shutdown(self, wait=True):
+        """Thread havuzunu kapatır"""
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,183 @@
+import errno
+import random
+import re
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+TRANSIENT = 'transient'
+THROTTLED = 'throttled'
+PERMANENT = 'permanent'
+
+# Sunucunun bizi yavaşlattığını gösteren kodlar devre kesiciyi besler
+THROTTLE_STATUSES = (403, 429)
+TRANSIENT_STATUSES = (408, 500, 502, 503, 504)
+
+PERMANENT_MESSAGES = (
+    'video unavailable',
+    'private video',
+    'this video is not available',
+    'this video has been removed',
+    'sign in to confirm your age',
+    'members-only',
+    'copyright',
+    'unsupported url',
+    'is not a valid url',
+    'no video formats found',
+    'requested format is not available',
+    'premieres in'
+)
+
+TRANSIENT_MESSAGES = (
+    'timed out',
+    'connection reset',
+    'connection refused',
+    'connection aborted',
+    'remote end closed',
+    'temporary failure in name resolution',
+    'network is unreachable',
+    'incomplete read',
+    'bağlantı erken kapandı'
+)
+
+def _error_chain(error):
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        exc_info = getattr(error, 'exc_info', None)
+        if exc_info and isinstance(exc_info, tuple) and exc_info[1] is not error:
+            error = exc_info[1]
+        else:
+            error = error.__cause__ or error.__context__
+
+def http_status(error):
+    """Hata zincirindeki HTTP durum kodunu, yoksa None döndürür"""
+    for item in _error_chain(error):
+        for attr in ('status', 'code'):
+            value = getattr(item, attr, None)
+            if isinstance(value, int) and 100 <= value < 600:
+                return value
+    match = re.search(r'HTTP Error (\d{3})', str(error))
+    return int(match.group(1)) if match else None
+
+def host_of(url):
+    """Devre kesicide kullanılan sunucu adını döndürür"""
+    host = (urlparse(url).hostname or '').lower()
+    for prefix in ('www.', 'm.', 'music.'):
+        if host.startswith(prefix):
+            return host[len(prefix):]
+    return host
+
+class RetryPolicy:
+    """Hataları sınıflandırır ve yeniden deneme bekleme süresini hesaplar.
+
+    Kalıcı hatalar (silinmiş, özel, desteklenmeyen video, dolu disk)
+    hiç tekrarlanmaz. Geçici hatalar ve 429/403 yanıtları en fazla
+    max_attempts kez, üstel artan ve rastgele dağıtılmış (jitter)
+    aralıklarla yeniden denenir; böylece aynı anda düşen işler sunucuya
+    aynı anda dönmez.
+    """
+
+    def __init__(self, max_attempts=4, base_delay=2.0, max_delay=120.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def classify(self, error):
+        """Hatanın geçici, sınırlandırma veya kalıcı olduğunu döndürür"""
+        status = http_status(error)
+        if status in THROTTLE_STATUSES:
+            return THROTTLED
+        if status in TRANSIENT_STATUSES:
+            return TRANSIENT
+
+        for item in _error_chain(error):
+            if isinstance(item, OSError) and item.errno in (errno.ENOSPC, errno.EACCES, errno.EROFS):
+                return PERMANENT
+            if isinstance(item, (socket.timeout, ConnectionError, TimeoutError)):
+                return TRANSIENT
+
+        # Sarmalayan hata kendi mesajını koyabilir; zincirdeki tüm mesajlara bakılır
+        message = ' '.join(str(item) for item in _error_chain(error)).lower()
+        if any(text in message for text in PERMANENT_MESSAGES):
+            return PERMANENT
+        if status is not None and 400 <= status < 500:
+            return PERMANENT
+        if any(text in message for text in TRANSIENT_MESSAGES):
+            return TRANSIENT
+        # Tanınmayan hatalar da sınırlı sayıda denenir
+        return TRANSIENT
+
+    def should_retry(self, kind, attempts):
+        """Bu kadar deneme yapılmış iş için yeniden denemenin gerekip gerekmediğini döndürür"""
+        return kind != PERMANENT and attempts < self.max_attempts
+
+    def delay(self, attempts):
+        """attempts. denemeden sonra beklenecek süreyi (saniye) döndürür"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** max(0, attempts - 1)))
+        return random.uniform(ceiling / 2, ceiling)
+
+class CircuitBreaker:
+    """Art arda 429/403 döndüren sunucuya istekleri geçici olarak keser.
+
+    failure_threshold kadar sınırlandırma hatasından sonra devre açılır ve
+    reset_timeout boyunca o sunucudaki işler başlatılmaz. Süre dolunca tek
+    bir deneme işine izin verilir (yarı açık); başarılı olursa devre
+    kapanır, yine sınırlandırılırsa süre iki katına çıkarak tekrar açılır.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60.0, max_timeout=900.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_timeout = max_timeout
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host):
+        return self._hosts.setdefault(host, {
+            'failures': 0,
+            'open_until': 0.0,
+            'timeout': self.reset_timeout,
+            'probing': False
+        })
+
+    def blocked_for(self, host):
+        """Sunucuya istek atılabiliyorsa 0, yoksa kalan bekleme süresini döndürür"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if not state or not state['open_until']:
+                return 0
+            remaining = state['open_until'] - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if state['probing']:
+                # Yarı açık devrede deneme işi sürerken diğerleri bekler
+                return min(self.reset_timeout, state['timeout']) / 4
+            state['probing'] = True
+            return 0
+
+    def record_success(self, host):
+        """Başarılı isteği kaydeder ve devreyi kapatır"""
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def abort_probe(self, host):
+        """Sonucu belirsiz biten deneme yerine yenisine izin verir"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state:
+                state['probing'] = False
+
+    def record_failure(self, host):
+        """Sınırlandırma hatasını kaydeder, gerekirse devreyi açar"""
+        with self._lock:
+            state = self._state(host)
+            state['failures'] += 1
+            if state['probing']:
+                state['timeout'] = min(self.max_timeout, state['timeout'] * 2)
+            elif state['failures'] < self.failure_threshold:
+                return
+            state['probing'] = False
+            state['open_until'] = time.monotonic() + state['timeout']
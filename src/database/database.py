@@ -1,65 +1,90 @@
 import sqlite3
+import threading
 import bcrypt
 from pathlib import Path
+from src.database.migrations import migrate, LATEST_VERSION
+
+BUSY_TIMEOUT = 10
+CACHE_SIZE_KB = 16 * 1024
+# OFF en hızlısı ama elektrik kesintisinde veritabanı bozulabilir; NORMAL WAL
+# kipinde yalnızca son commit'leri kaybettirir, FULL her commit'te fsync yapar
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
 
 class Database:
-    def __init__(self):
-        self.db_file = 'youtube_downloader.db'
-        self.conn = None
+    """SQLite bağlantılarını thread başına yönetir.
+
+    Her thread conn özelliğine ilk eriştiğinde kendi bağlantısını açar;
+    bağlantı thread bitince kapanır. WAL kipinde okuyucular yazanı
+    beklemez, yazanlar birbirini busy_timeout süresince bekler. Yazma
+    işlemleri 'with db.conn as conn:' ile yapılmalıdır; hata olursa işlem
+    geri alınır ve yazma kilidi açık kalmaz. synchronous, commit'lerin diske
+    ne kadar sıkı aktarılacağını belirler.
+    """
+
+    def __init__(self, db_file='youtube_downloader.db', synchronous='NORMAL'):
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f'Geçersiz synchronous değeri: {synchronous}')
+        self.db_file = db_file
+        self.synchronous = synchronous
+        self._local = threading.local()
         self.connect()
 
     def connect(self):
-        """Veritabanına bağlantı oluşturur"""
+        """Çağıran thread için veritabanı bağlantısını oluşturur"""
         try:
-            self.conn = sqlite3.connect(self.db_file)
-            self.conn.row_factory = sqlite3.Row
+            self._local.conn = self._open()
         except sqlite3.Error as e:
+            self._local.conn = None
             print(f"Veritabanı bağlantı hatası: {e}")
 
-    def create_tables(self):
-        """Gerekli tabloları oluşturur"""
+    def _open(self):
+        conn = sqlite3.connect(self.db_file, timeout=BUSY_TIMEOUT)
+        conn.row_factory = sqlite3.Row
+        # WAL kalıcıdır; diğer ayarlar bağlantı başına yapılır
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA synchronous={self.synchronous}')
+        conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KB}')
+        conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT * 1000}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+
+    @property
+    def conn(self):
+        """Çağıran thread'e ait bağlantıyı döndürür, yoksa açar"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Çağıran thread'in bağlantısını kapatır"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def migrate(self):
+        """Şemayı son sürüme getirir; şema güncelse yalnızca sürümü okur"""
         try:
-            cursor = self.conn.cursor()
-            
-            # Kullanıcılar tablosu
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password TEXT NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # İndirilen dosyalar tablosu
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS downloads (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    title TEXT NOT NULL,
-                    url TEXT NOT NULL,
-                    file_path TEXT NOT NULL,
-                    file_type TEXT NOT NULL,
-                    download_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id)
-                )
-            ''')
-            
-            self.conn.commit()
+            version = migrate(self.conn)
         except sqlite3.Error as e:
-            print(f"Tablo oluşturma hatası: {e}")
+            print(f"Şema güncelleme hatası: {e}")
+            return False
+        if version > LATEST_VERSION:
+            print(f"Veritabanı şeması ({version}) uygulamadan ({LATEST_VERSION}) yeni")
+        return True
 
     def register_user(self, username, password, email):
         """Yeni kullanıcı kaydeder"""
         try:
             hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT INTO users (username, password, email)
-                VALUES (?, ?, ?)
-            ''', (username, hashed, email))
-            self.conn.commit()
+            with self.conn as conn:
+                conn.execute('''
+                    INSERT INTO users (username, password, email)
+                    VALUES (?, ?, ?)
+                ''', (username, hashed, email))
             return True
         except sqlite3.IntegrityError:
             return False
@@ -84,12 +109,11 @@ class Database:
     def add_download(self, user_id, title, url, file_path, file_type):
         """İndirilen dosyayı kaydeder"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT INTO downloads (user_id, title, url, file_path, file_type)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (user_id, title, url, file_path, file_type))
-            self.conn.commit()
+            with self.conn as conn:
+                conn.execute('''
+                    INSERT INTO downloads (user_id, title, url, file_path, file_type)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (user_id, title, url, file_path, file_type))
             return True
         except sqlite3.Error as e:
             print(f"İndirme kayıt hatası: {e}")
@@ -107,5 +131,7 @@ class Database:
 
     def __del__(self):
         """Veritabanı bağlantısını kapatır"""
-        if self.conn:
-            self.conn.close() 
\ No newline at end of file
+        try:
+            self.close()
+        except sqlite3.Error:
+            pass 
\ No newline at end of file
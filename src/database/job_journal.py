@@ -0,0 +1,171 @@
+import os
+import socket
+import sqlite3
+import threading
+from src.database.write_behind import WriteBehindQueue
+
+UNFINISHED_STATES = ('queued', 'running', 'paused', 'processing')
+HEARTBEAT_INTERVAL = 15.0
+# Bu kadar süre yoklama yazmayan sürecin işleri sahipsiz sayılır
+STALE_AFTER = 60
+
+def process_owner():
+    """Bu süreci iş günlüğünde tanımlayan 'makine:pid' değerini döndürür"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+def owner_alive(owner):
+    """Sahip süreç bu makinedeyse yaşayıp yaşamadığını, bilinemiyorsa None döndürür"""
+    host, _, pid = (owner or '').rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit() or os.name != 'posix':
+        # Windows'ta os.kill süreci sonlandırır; orada yalnızca yoklamaya bakılır
+        return None
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobJournal:
+    """İndirme işlerinin durumunu download_jobs tablosuna adım adım yazar.
+
+    Uygulama kapanır ya da çökerse yarım kalan işler buradan okunup
+    yt-dlp'nin continuedl desteğiyle kaldığı yerden sürdürülür. İlerleme ve
+    durum güncellemeleri writer üzerinden toplu yazılır; aynı işin bekleyen
+    eski güncellemesi yenisiyle değiştirilir.
+
+    Aynı veritabanını birden fazla süreç kullanabildiği için her kayıt onu
+    açan süreci (owner) taşır ve süreç, bitmemiş işlerinin updated_at
+    alanını HEARTBEAT_INTERVAL aralıklarla yeniler. claim_unfinished
+    yalnızca sahibi ölmüş ya da STALE_AFTER süresince yoklama yazmamış
+    kayıtları devralır.
+    """
+
+    def __init__(self, db, writer=None, owner=None):
+        self.db = db
+        self.writer = writer or WriteBehindQueue(db, flush_interval=0)
+        self.owner = owner or process_owner()
+        self._owned = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._heartbeat = None
+
+    def create(self, job):
+        """İş için günlük kaydı açar ve kaydın kimliğini döndürür"""
+        try:
+            with self.db.conn as conn:
+                cursor = conn.execute('''
+                    INSERT INTO download_jobs (user_id, url, format_id, download_path, state,
+                                               owner, connections, priority, stream_audio)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (job.user_id, job.url, job.format_id, job.download_path, job.state,
+                      self.owner, job.connections, job.priority, int(job.stream_audio)))
+        except sqlite3.Error as e:
+            print(f"İş günlüğü kayıt hatası: {e}")
+            return None
+        self._own([cursor.lastrowid])
+        return cursor.lastrowid
+
+    def update_progress(self, journal_id, target_path, downloaded_bytes, total_bytes):
+        """İndirilen bayt sayısını ve hedef dosyayı günceller"""
+        if journal_id is None:
+            return False
+        self.writer.submit('''
+            UPDATE download_jobs
+            SET target_path = ?, downloaded_bytes = ?, total_bytes = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (target_path, downloaded_bytes, total_bytes, journal_id),
+            key=('job_progress', journal_id))
+        return True
+
+    def set_state(self, journal_id, state):
+        """İşin durumunu günceller"""
+        if journal_id is None:
+            return False
+        if state not in UNFINISHED_STATES:
+            with self._lock:
+                self._owned.discard(journal_id)
+        self.writer.submit('''
+            UPDATE download_jobs SET state = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (state, journal_id), key=('job_state', journal_id))
+        return True
+
+    def set_priority(self, journal_id, priority):
+        """İşin önceliğini günceller"""
+        if journal_id is None:
+            return False
+        self.writer.submit('UPDATE download_jobs SET priority = ? WHERE id = ?',
+                           (priority, journal_id), key=('job_priority', journal_id))
+        return True
+
+    def claim_unfinished(self):
+        """Sahipsiz kalmış yarım işleri bu süreç adına devralır ve listeler.
+
+        Seçim ve sahiplik güncellemesi tek BEGIN IMMEDIATE işleminde yapılır;
+        aynı anda açılan iki süreç aynı işi devralamaz.
+        """
+        self.writer.flush()
+        conn = self.db.conn
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                cursor = conn.execute(f'''
+                    SELECT *, updated_at < datetime('now', ?) AS stale FROM download_jobs
+                    WHERE state IN ({', '.join('?' for _ in UNFINISHED_STATES)})
+                    ORDER BY id
+                ''', (f'-{STALE_AFTER} seconds',) + UNFINISHED_STATES)
+                with self._lock:
+                    owned = set(self._owned)
+                rows = [dict(row) for row in cursor.fetchall()
+                        if self._claimable(row, owned)]
+                conn.executemany('''
+                    UPDATE download_jobs SET owner = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', [(self.owner, row['id']) for row in rows])
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        except sqlite3.Error as e:
+            print(f"İş günlüğü okuma hatası: {e}")
+            return []
+
+        for row in rows:
+            row['owner'] = self.owner
+            del row['stale']
+        self._own([row['id'] for row in rows])
+        return rows
+
+    def _claimable(self, row, owned):
+        if row['owner'] == self.owner:
+            # Aynı pid'i daha önce çökmüş bir süreç kullanmış olabilir
+            return row['id'] not in owned
+        if row['stale']:
+            return True
+        return owner_alive(row['owner']) is False
+
+    def _own(self, journal_ids):
+        with self._lock:
+            self._owned.update(journal_ids)
+            if self._heartbeat is None and not self._stopped.is_set():
+                self._heartbeat = threading.Thread(target=self._heartbeat_loop,
+                                                   name='journal-heartbeat', daemon=True)
+                self._heartbeat.start()
+
+    def _heartbeat_loop(self):
+        while not self._stopped.wait(HEARTBEAT_INTERVAL):
+            with self._lock:
+                owned = list(self._owned)
+            if not owned:
+                continue
+            self.writer.submit(f'''
+                UPDATE download_jobs SET updated_at = CURRENT_TIMESTAMP
+                WHERE owner = ? AND id IN ({', '.join('?' for _ in owned)})
+            ''', [self.owner] + owned, key=('job_heartbeat',))
+
+    def close(self):
+        """Yoklamayı durdurur; işler bir sonraki açılışta devralınabilir"""
+        self._stopped.set()
@@ -0,0 +1,75 @@
+import json
+import sqlite3
+import time
+
+DEFAULT_TTL = 3600
+DEFAULT_MAX_ENTRIES = 500
+
+class MetadataCache:
+    """yt-dlp video bilgilerini video kimliğine göre SQLite'ta saklar.
+
+    Kayıtlar TTL dolunca geçersiz sayılır, kayıt sayısı max_entries'i
+    aşarsa en uzun süredir okunmayanlar silinir. Format URL'leri zamanla
+    geçersizleştiği için TTL birkaç saati geçmemelidir.
+    """
+
+    def __init__(self, db, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.db = db
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    def get(self, video_id):
+        """Önbellekteki video bilgisini döndürür, yoksa veya süresi dolmuşsa None"""
+        if not video_id:
+            return None
+        try:
+            with self.db.conn as conn:
+                row = conn.execute('SELECT info_json, created_at FROM metadata_cache '
+                                   'WHERE video_id = ?', (video_id,)).fetchone()
+                if not row:
+                    return None
+
+                now = time.time()
+                if now - row['created_at'] > self.ttl:
+                    conn.execute('DELETE FROM metadata_cache WHERE video_id = ?', (video_id,))
+                    return None
+
+                conn.execute('UPDATE metadata_cache SET last_access = ? WHERE video_id = ?',
+                             (now, video_id))
+            return json.loads(row['info_json'])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Önbellek okuma hatası: {e}")
+            return None
+
+    def put(self, video_id, info):
+        """Video bilgisini önbelleğe yazar ve fazla kayıtları temizler"""
+        if not video_id or not info:
+            return False
+        try:
+            info_json = json.dumps(info, default=str)
+            now = time.time()
+            with self.db.conn as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO metadata_cache (video_id, info_json, created_at, last_access)
+                    VALUES (?, ?, ?, ?)
+                ''', (video_id, info_json, now, now))
+                conn.execute('DELETE FROM metadata_cache WHERE created_at < ?', (now - self.ttl,))
+                conn.execute('''
+                    DELETE FROM metadata_cache WHERE video_id IN (
+                        SELECT video_id FROM metadata_cache
+                        ORDER BY last_access DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                ''', (self.max_entries,))
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Önbellek yazma hatası: {e}")
+            return False
+
+    def invalidate(self, video_id):
+        """Video bilgisini önbellekten siler"""
+        try:
+            with self.db.conn as conn:
+                conn.execute('DELETE FROM metadata_cache WHERE video_id = ?', (video_id,))
+        except sqlite3.Error as e:
+            print(f"Önbellek silme hatası: {e}")
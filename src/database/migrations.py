@@ -0,0 +1,159 @@
+import sqlite3
+
+def add_column_if_missing(cursor, table, column, definition):
+    """Mevcut kurulumlardaki tabloya eksik sütunu ekler"""
+    cursor.execute(f'PRAGMA table_info({table})')
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+# Sürüm tablosundan önceki kurulumlarda tablo ve sütunların bir kısmı zaten
+# vardır; adımlar bu yüzden IF NOT EXISTS ve add_column_if_missing kullanır.
+
+def _create_users_and_downloads(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS downloads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            title TEXT NOT NULL,
+            url TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            file_type TEXT NOT NULL,
+            download_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+def _create_metadata_cache(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS metadata_cache (
+            video_id TEXT PRIMARY KEY,
+            info_json TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_metadata_cache_last_access
+        ON metadata_cache (last_access)
+    ''')
+
+def _create_download_jobs(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS download_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            url TEXT NOT NULL,
+            format_id TEXT NOT NULL,
+            download_path TEXT NOT NULL,
+            target_path TEXT,
+            downloaded_bytes INTEGER DEFAULT 0,
+            total_bytes INTEGER,
+            state TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_download_jobs_state
+        ON download_jobs (state)
+    ''')
+
+def _add_duplicate_check_columns(cursor):
+    add_column_if_missing(cursor, 'downloads', 'video_id', 'TEXT')
+    add_column_if_missing(cursor, 'downloads', 'file_name', 'TEXT')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_downloads_video
+        ON downloads (video_id, file_type, file_path)
+    ''')
+
+def _add_size_and_duration(cursor):
+    add_column_if_missing(cursor, 'downloads', 'file_size', 'INTEGER')
+    add_column_if_missing(cursor, 'downloads', 'duration', 'REAL')
+
+def _add_history_index(cursor):
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_downloads_user_date
+        ON downloads (user_id, download_date)
+    ''')
+
+def _add_job_owner_and_options(cursor):
+    add_column_if_missing(cursor, 'download_jobs', 'owner', 'TEXT')
+    add_column_if_missing(cursor, 'download_jobs', 'connections', 'INTEGER DEFAULT 1')
+    add_column_if_missing(cursor, 'download_jobs', 'priority', 'INTEGER DEFAULT 0')
+    add_column_if_missing(cursor, 'download_jobs', 'stream_audio', 'INTEGER DEFAULT 0')
+
+# (sürüm, açıklama, adım) sırayla uygulanır. Yayımlanmış adımlar
+# değiştirilmez; şema değişikliği listenin sonuna yeni adım olarak eklenir.
+MIGRATIONS = [
+    (1, 'Kullanıcı ve indirme tabloları', _create_users_and_downloads),
+    (2, 'Video bilgisi önbelleği', _create_metadata_cache),
+    (3, 'İndirme işi günlüğü', _create_download_jobs),
+    (4, 'Mükerrer indirme kontrolü için video kimliği ve dosya adı',
+     _add_duplicate_check_columns),
+    # Geçmiş listesi dosya sistemine dokunmadan boyut ve süreyi gösterir
+    (5, 'İndirme boyutu ve süresi', _add_size_and_duration),
+    # Geçmiş listesi kullanıcıya göre tarih sırasıyla sayfalanır
+    (6, 'Geçmiş sayfalama indeksi', _add_history_index),
+    # Aynı veritabanını kullanan süreçler birbirinin işini sahiplenmesin
+    (7, 'İş sahibi ve indirme seçenekleri', _add_job_owner_and_options)
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def schema_version(conn):
+    """Veritabanına uygulanmış son şema sürümünü, hiç yoksa 0 döndürür"""
+    try:
+        row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    except sqlite3.OperationalError:
+        # Sürüm tablosu yok: yeni ya da sürümlemeden önceki bir kurulum
+        return 0
+    return row[0] or 0
+
+def migrate(conn, migrations=MIGRATIONS):
+    """Bekleyen şema adımlarını sırayla uygular ve ulaşılan sürümü döndürür.
+
+    Her adım, sürüm kaydıyla birlikte tek işlemde (transaction) yapılır;
+    adım hata verirse geri alınır ve sonraki adımlara geçilmez. BEGIN
+    IMMEDIATE yazma kilidini baştan aldığı için aynı anda açılan iki süreç
+    aynı adımı iki kez uygulayamaz.
+    """
+    latest = migrations[-1][0] if migrations else 0
+    version = schema_version(conn)
+    if version >= latest:
+        return version
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    for step_version, description, step in migrations:
+        if step_version <= version:
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Kilit beklenirken başka süreç bu adımı uygulamış olabilir
+            if schema_version(conn) >= step_version:
+                conn.rollback()
+                continue
+            cursor = conn.cursor()
+            step(cursor)
+            cursor.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                           (step_version, description))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = step_version
+    return version
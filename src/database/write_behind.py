@@ -0,0 +1,156 @@
+import itertools
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_BATCH = 500
+
+class WriteBehindQueue:
+    """Veritabanı yazımlarını biriktirip tek işlemde (transaction) yazar.
+
+    Farklı thread'lerden gelen yazımlar kuyruğa alınır; yazıcı thread'i
+    ilk yazımdan flush_interval saniye sonra ya da max_batch yazım
+    birikince hepsini tek commit ile, dolayısıyla tek fsync ile yazar.
+    Aynı key ile gelen yazım bekleyen eskisinin yerine geçer; sık
+    güncellenen ilerleme ve durum kayıtları böylece bir kez yazılır.
+
+    on_commit, yazım kalıcı olduktan sonra imleçle yazıcı thread'inde
+    çağrılır; yazım tek başına da yapılamazsa on_error hatayla çağrılır.
+    flush_interval 0 ise ya da kuyruk kapatıldıysa yazımlar
+    çağıran thread'de hemen yapılır. Uygulama kapanırken close() ile
+    bekleyen yazımlar diske aktarılmalıdır.
+    """
+
+    def __init__(self, db, flush_interval=DEFAULT_FLUSH_INTERVAL, max_batch=DEFAULT_MAX_BATCH):
+        self.db = db
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.max_batch = max(1, int(max_batch))
+        self._pending = OrderedDict()
+        self._first_at = None
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._written_seq = 0
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+        if self.flush_interval > 0:
+            self._thread = threading.Thread(target=self._writer_loop, name='db-writer',
+                                            daemon=True)
+            self._thread.start()
+
+    def submit(self, query, params=(), key=None, on_commit=None, on_error=None):
+        """Yazımı kuyruğa ekler"""
+        item = (query, tuple(params), on_commit, on_error)
+        with self._cond:
+            if self._thread is not None and not self._closed:
+                seq = next(self._seq)
+                self._last_seq = seq
+                if key is None:
+                    key = ('seq', seq)
+                else:
+                    # Yeni değer kuyruğun sonuna geçer, sıra son yazıma göre korunur
+                    self._pending.pop(key, None)
+                self._pending[key] = item
+                if self._first_at is None:
+                    self._first_at = time.monotonic()
+                if len(self._pending) >= self.max_batch:
+                    self._cond.notify_all()
+                else:
+                    self._cond.notify()
+                return
+        self._write([item])
+
+    def flush(self, timeout=None):
+        """Şu ana kadar kuyruğa alınan yazımlar diske aktarılana kadar bekler"""
+        with self._cond:
+            if self._thread is None:
+                return True
+            target = self._last_seq
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: self._written_seq >= target or not self._thread.is_alive(), timeout)
+
+    def close(self, timeout=None):
+        """Bekleyen yazımları aktarır ve yazıcı thread'ini durdurur"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _take_batch(self):
+        with self._cond:
+            while True:
+                if self._pending:
+                    waited = time.monotonic() - self._first_at
+                    remaining = self.flush_interval - waited
+                    if (remaining <= 0 or self._closed or self._flush_requested
+                            or len(self._pending) >= self.max_batch):
+                        break
+                    self._cond.wait(remaining)
+                elif self._closed:
+                    return None
+                else:
+                    self._flush_requested = False
+                    self._cond.wait()
+
+            batch = list(self._pending.values())
+            self._pending.clear()
+            self._first_at = None
+            self._flush_requested = False
+            return batch, self._last_seq
+
+    def _writer_loop(self):
+        try:
+            while True:
+                taken = self._take_batch()
+                if taken is None:
+                    return
+                batch, seq = taken
+                self._write(batch)
+                with self._cond:
+                    self._written_seq = seq
+                    self._cond.notify_all()
+        finally:
+            self.db.close()
+            with self._cond:
+                self._cond.notify_all()
+
+    def _write(self, batch):
+        results = []
+        errors = []
+        try:
+            with self.db.conn as conn:
+                for query, params, on_commit, _ in batch:
+                    results.append((on_commit, conn.execute(query, params)))
+        except sqlite3.Error as e:
+            print(f"Toplu yazma hatası: {e}")
+            # Hatalı tek kayıt diğerlerini düşürmesin diye tek tek yeniden yazılır
+            results = []
+            for query, params, on_commit, on_error in batch:
+                try:
+                    with self.db.conn as conn:
+                        results.append((on_commit, conn.execute(query, params)))
+                except sqlite3.Error as e:
+                    print(f"Veritabanı yazma hatası: {e}")
+                    errors.append((on_error, e))
+
+        for on_commit, cursor in results:
+            if on_commit:
+                try:
+                    on_commit(cursor)
+                except Exception as e:
+                    print(f"Yazım sonrası işlem hatası: {e}")
+        for on_error, error in errors:
+            if on_error:
+                try:
+                    on_error(error)
+                except Exception as e:
+                    print(f"Yazım hatası işleme hatası: {e}")
@@ -1,6 +1,13 @@
+import os
+
+# Sütun listesi, sorgularda yalnızca gereken alanlar seçilirken doğrulama için kullanılır
+COLUMNS = ('id', 'user_id', 'title', 'url', 'file_path', 'file_type', 'download_date',
+           'video_id', 'file_name', 'file_size', 'duration')
+
 class Download:
     def __init__(self, id=None, user_id=None, title=None, url=None, file_path=None, 
-                 file_type=None, download_date=None):
+                 file_type=None, download_date=None, video_id=None, file_name=None,
+                 file_size=None, duration=None):
         self.id = id
         self.user_id = user_id
         self.title = title
@@ -8,21 +15,25 @@ class Download:
         self.file_path = file_path
         self.file_type = file_type
         self.download_date = download_date
+        self.video_id = video_id
+        self.file_name = file_name
+        self.file_size = file_size
+        self.duration = duration
+
+    @property
+    def full_path(self):
+        """Kaydedilen dosyanın tam yolunu, bilinmiyorsa None döndürür"""
+        if not self.file_name:
+            return None
+        return os.path.join(self.file_path, self.file_name)
 
     @staticmethod
     def from_db_row(row):
-        """Veritabanı satırından Download nesnesi oluşturur"""
+        """Veritabanı satırından Download nesnesi oluşturur, seçilmeyen sütunlar None olur"""
         if not row:
             return None
-        return Download(
-            id=row['id'],
-            user_id=row['user_id'],
-            title=row['title'],
-            url=row['url'],
-            file_path=row['file_path'],
-            file_type=row['file_type'],
-            download_date=row['download_date']
-        )
+        values = dict(row)
+        return Download(**{column: values.get(column) for column in COLUMNS})
 
     def to_dict(self):
         """Download nesnesini sözlüğe dönüştürür"""
@@ -33,5 +44,9 @@ class Download:
             'url': self.url,
             'file_path': self.file_path,
             'file_type': self.file_type,
-            'download_date': self.download_date
+            'download_date': self.download_date,
+            'video_id': self.video_id,
+            'file_name': self.file_name,
+            'file_size': self.file_size,
+            'duration': self.duration
         } 
\ No newline at end of file
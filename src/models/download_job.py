@@ -0,0 +1,125 @@
+from src.utils.file_utils import normalize_path
+
+# Komut satırı ve daemon'da kullanılan format adlarının yt-dlp karşılıkları
+FORMATS = {
+    'video': 'best',
+    'audio': 'bestaudio/best'
+}
+# Arayüzde seçilebilen en fazla paralel bağlantı sayısı
+MAX_CONNECTIONS = 8
+# İş bittikten sonra yt-dlp bilgisinden saklanan alanlar
+SUMMARY_KEYS = ('id', 'title', 'duration')
+
+class DownloadJob:
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    PAUSED = 'paused'
+    PROCESSING = 'processing'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+    CANCELLED = 'cancelled'
+
+    FINISHED_STATES = (COMPLETED, FAILED, SKIPPED, CANCELLED)
+
+    def __init__(self, id=None, url=None, download_path=None, format_id='best',
+                 user_id=None, connections=1, priority=0, stream_audio=False):
+        self.id = id
+        self.url = url
+        self.download_path = download_path
+        self.format_id = format_id
+        self.user_id = user_id
+        self.connections = connections
+        self.priority = priority
+        self.stream_audio = stream_audio
+        self.queue_seq = None
+        self.cancel_requested = False
+        self.preempt_requested = False
+        self.pause_requested = False
+        self.attempts = 0
+        self.retry_at = None
+        self.journal_id = None
+        # Aynı video kuyrukta beklerken atlanan işte o işin kimliği
+        self.duplicate_of = None
+        self.video_id = None
+        self.output_path = None
+        self.file_size = None
+        self.state = DownloadJob.QUEUED
+        self.progress = 0.0
+        self.downloaded_bytes = 0
+        self.total_bytes = None
+        self.speed = None
+        self.eta = None
+        self.info = None
+        self.error = ''
+
+    @property
+    def file_type(self):
+        """İşin dosya türünü döndürür"""
+        return 'audio' if self.format_id == 'bestaudio/best' else 'video'
+
+    @property
+    def resumable(self):
+        """Durdurulan indirmenin kaldığı yerden sürüp sürmeyeceğini döndürür.
+        Doğrudan MP3'e aktarılan ses akışı yarım dosya bırakmaz."""
+        return not (self.stream_audio and self.file_type == 'audio')
+
+    @property
+    def title(self):
+        """Video başlığını, bilinmiyorsa URL'yi döndürür"""
+        if self.info and self.info.get('title'):
+            return self.info['title']
+        return self.url
+
+    def progress_snapshot(self):
+        """GUI'ye taşınacak ilerleme bilgisini döndürür"""
+        return {
+            'percent': self.progress,
+            'downloaded_bytes': self.downloaded_bytes,
+            'total_bytes': self.total_bytes,
+            'speed': self.speed,
+            'eta': self.eta
+        }
+
+    def duplicate_key(self):
+        """Mükerrer kontrolünde kullanılan anahtarı döndürür"""
+        if not self.video_id or not self.download_path:
+            return None
+        return (self.video_id, self.file_type, normalize_path(self.download_path))
+
+    def trim_info(self):
+        """yt-dlp bilgisinden yalnızca geçmiş kaydı ve başlık için gerekenleri
+        tutar; format, küçük resim ve altyazı listeleri bellekten çıkar"""
+        if self.info:
+            self.info = {key: self.info[key] for key in SUMMARY_KEYS if key in self.info}
+
+    def is_finished(self):
+        """İşin sonlanıp sonlanmadığını döndürür"""
+        return self.state in DownloadJob.FINISHED_STATES
+
+    def to_dict(self):
+        """DownloadJob nesnesini sözlüğe dönüştürür"""
+        return {
+            'id': self.id,
+            'url': self.url,
+            'download_path': self.download_path,
+            'format_id': self.format_id,
+            'user_id': self.user_id,
+            'video_id': self.video_id,
+            'connections': self.connections,
+            'priority': self.priority,
+            'stream_audio': self.stream_audio,
+            'state': self.state,
+            'attempts': self.attempts,
+            'retry_at': self.retry_at,
+            'progress': self.progress,
+            'downloaded_bytes': self.downloaded_bytes,
+            'total_bytes': self.total_bytes,
+            'speed': self.speed,
+            'eta': self.eta,
+            'title': self.title,
+            'output_path': self.output_path,
+            'file_size': self.file_size,
+            'error': self.error,
+            'duplicate_of': self.duplicate_of
+        }
@@ -6,6 +6,11 @@ def ensure_dir(directory):
     """Dizinin var olduğundan emin olur"""
     Path(directory).mkdir(parents=True, exist_ok=True)
 
+def normalize_path(path):
+    """Klasör karşılaştırmaları için yolu mutlak, gerçek ve büyük/küçük harf
+    duyarsız (Windows) hale getirir"""
+    return os.path.normcase(os.path.realpath(os.path.expanduser(path)))
+
 def get_safe_filename(filename):
     """Güvenli dosya adı oluşturur"""
     # Geçersiz karakterleri kaldır
@@ -25,7 +30,10 @@ def get_safe_filename(filename):
 
 def get_file_size(file_path):
     """Dosya boyutunu okunabilir formatta döndürür"""
-    size = os.path.getsize(file_path)
+    return format_size(os.path.getsize(file_path))
+
+def format_size(size):
+    """Bayt cinsinden boyutu okunabilir formatta döndürür"""
     for unit in ['B', 'KB', 'MB', 'GB']:
         if size < 1024:
             return f"{size:.1f} {unit}"
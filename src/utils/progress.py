@@ -0,0 +1,50 @@
+import time
+
+DEFAULT_MAX_RATE = 4
+REFRESH_INTERVAL = 1.0
+
+class ProgressCoalescer:
+    """yt-dlp ilerleme olaylarını iş başına saniyede en fazla max_rate olaya indirger.
+
+    Tam sayı yüzdesi değişmediyse olay, hız ve kalan süreyi tazelemek için
+    yalnızca REFRESH_INTERVAL aralıklarla geçirilir. 'finished' olayları
+    her zaman geçer.
+    """
+
+    def __init__(self, max_rate=DEFAULT_MAX_RATE):
+        self.interval = 1.0 / max_rate if max_rate and max_rate > 0 else 0
+        self.last_emit = None
+        self.last_percent = None
+
+    def update(self, d):
+        """Olay gönderilmeliyse ilerleme özetini, gönderilmemeliyse None döndürür"""
+        status = d.get('status')
+        if status not in ('downloading', 'finished'):
+            return None
+
+        total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+        downloaded = d.get('downloaded_bytes') or 0
+        if status == 'finished':
+            percent = 100.0
+        elif total > 0:
+            percent = min(downloaded / total * 100, 100.0)
+        else:
+            percent = self.last_percent or 0.0
+
+        now = time.monotonic()
+        if status == 'downloading' and self.last_emit is not None:
+            elapsed = now - self.last_emit
+            if elapsed < self.interval:
+                return None
+            if int(percent) == int(self.last_percent) and elapsed < REFRESH_INTERVAL:
+                return None
+
+        self.last_emit = now
+        self.last_percent = percent
+        return {
+            'percent': percent,
+            'downloaded_bytes': downloaded,
+            'total_bytes': total or None,
+            'speed': d.get('speed'),
+            'eta': d.get('eta')
+        }
@@ -0,0 +1,225 @@
+import errno
+import json
+import os
+import queue
+import re
+import ssl
+import threading
+import time
+import urllib.request
+from src.utils.file_utils import ensure_dir
+
+CHUNK_SIZE = 256 * 1024
+MIN_SEGMENT_SIZE = 1024 * 1024
+TIMEOUT = 30
+# yt-dlp'nin kendi .part dosyasıyla karışmaması için ayrı adlar kullanılır
+PART_SUFFIX = '.ranged.part'
+STATE_SUFFIX = '.ranged.json'
+STATE_SAVE_INTERVAL = 1.0
+
+def open_url(url, headers, ssl_context, byte_range=None):
+    """URL'yi verilen başlıklarla, istenirse bayt aralığıyla açar"""
+    request_headers = dict(headers or {})
+    if byte_range:
+        request_headers['Range'] = f'bytes={byte_range[0]}-{byte_range[1]}'
+    request = urllib.request.Request(url, headers=request_headers)
+    return urllib.request.urlopen(request, timeout=TIMEOUT, context=ssl_context)
+
+def probe_range_support(url, headers=None, ssl_context=None):
+    """Sunucunun Range desteğini ve dosya boyutunu döndürür: (boyut, destek)"""
+    with open_url(url, headers, ssl_context, (0, 0)) as response:
+        content_range = response.headers.get('Content-Range', '')
+        match = re.match(r'bytes 0-0/(\d+)', content_range)
+        if response.status == 206 and match:
+            return int(match.group(1)), True
+        length = response.headers.get('Content-Length')
+        return (int(length) if length else None), False
+
+def split_ranges(total_size, connections, chunk_size=None):
+    """Dosyayı bayt aralıklarına böler; aralık sayısı en az connections olur,
+    chunk_size verilirse hiçbir aralık ondan büyük olmaz"""
+    connections = max(1, min(connections, total_size // MIN_SEGMENT_SIZE or 1))
+    segment = -(-total_size // connections)
+    if chunk_size:
+        segment = min(segment, int(chunk_size))
+    return [(start, min(start + segment, total_size) - 1)
+            for start in range(0, total_size, segment)]
+
+def preallocate_file(f, size):
+    """Dosyayı size bayt olarak ayırır; mümkünse bloklar diskte gerçekten
+    ayrılır, değilse seyrek dosya oluşturulur"""
+    if size and hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+            return
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise
+    f.truncate(size)
+
+def load_state(state_path, part_path, total_size):
+    """Yarım kalan indirmenin aralık durumunu, geçersizse None döndürür"""
+    try:
+        with open(state_path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state['total_size'] != total_size or os.path.getsize(part_path) != total_size:
+            return None
+        if len(state['ranges']) != len(state['done']):
+            return None
+        return state
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def save_state(state_path, state):
+    """Aralık durumunu yarım yazılmış dosya bırakmadan kaydeder"""
+    temp_path = state_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(temp_path, state_path)
+
+def remove_partial(target_path):
+    """Yarım kalan aralıklı indirmenin dosyalarını siler"""
+    for path in (target_path + PART_SUFFIX, target_path + STATE_SUFFIX):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def ranged_download(url, target_path, connections=4, headers=None,
+                    progress_callback=None, throttle=None, verify=True,
+                    preallocate=False, chunk_size=None):
+    """Dosyayı paralel bayt aralıklarıyla indirip target_path'e birleştirir.
+
+    Veri <hedef>.ranged.part dosyasına yazılır, her aralığın ne kadarının
+    indiği <hedef>.ranged.json dosyasında tutulur. İndirme duraklatılır,
+    kesilir ya da hata verirse sonraki çağrı aynı boyuttaki dosyayı
+    kaldığı yerden sürdürür. chunk_size verilirse (YouTube büyük aralıkları
+    yavaşlattığı için 10 MB bildirir) aralıklar bu boyutu aşmaz ve
+    connections kadar thread sıradaki aralığı alır.
+
+    Sunucu Range desteklemiyorsa tek bağlantıyla indirilir; bu durumda
+    sürdürme yapılamaz ve hata olursa yarım dosya silinir. İlerleme
+    progress_callback(downloaded_bytes, total_bytes) ile bildirilir,
+    throttle(chunk_size) verilirse yalnızca yeni inen her parçadan sonra
+    çağrılır. preallocate açıksa dosya baştan tam boyutta ayrılır.
+    Dosya boyutunu döndürür.
+    """
+    ssl_context = None if verify else ssl._create_unverified_context()
+    total_size, supports_range = probe_range_support(url, headers, ssl_context)
+    part_path = target_path + PART_SUFFIX
+    state_path = target_path + STATE_SUFFIX
+    ensure_dir(os.path.dirname(os.path.abspath(target_path)))
+
+    lock = threading.Lock()
+    progress = {'downloaded': 0, 'saved_at': time.monotonic()}
+
+    if not supports_range or not total_size:
+        def report_single(length):
+            if throttle:
+                throttle(length)
+            progress['downloaded'] += length
+            if progress_callback:
+                progress_callback(progress['downloaded'], total_size)
+
+        try:
+            with open_url(url, headers, ssl_context) as response, open(part_path, 'wb') as f:
+                if preallocate and total_size:
+                    preallocate_file(f, total_size)
+                while True:
+                    chunk = response.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    report_single(len(chunk))
+                if total_size and progress['downloaded'] != total_size:
+                    raise IOError('Bağlantı erken kapandı')
+                f.truncate()
+        except BaseException:
+            remove_partial(target_path)
+            raise
+        os.replace(part_path, target_path)
+        return progress['downloaded']
+
+    state = load_state(state_path, part_path, total_size)
+    if state is None:
+        ranges = split_ranges(total_size, connections, chunk_size)
+        state = {'total_size': total_size, 'ranges': ranges, 'done': [0] * len(ranges)}
+        # Parçaların kendi konumlarına yazabilmesi için dosya tam boyutta açılır
+        with open(part_path, 'wb') as f:
+            if preallocate:
+                preallocate_file(f, total_size)
+            else:
+                f.truncate(total_size)
+        save_state(state_path, state)
+
+    ranges, done = state['ranges'], state['done']
+    progress['downloaded'] = sum(done)
+    if progress['downloaded'] and progress_callback:
+        progress_callback(progress['downloaded'], total_size)
+
+    pending = queue.Queue()
+    for index, (start, end) in enumerate(ranges):
+        if start + done[index] <= end:
+            pending.put(index)
+
+    errors = []
+
+    def report(index, length):
+        with lock:
+            done[index] += length
+            progress['downloaded'] += length
+            downloaded = progress['downloaded']
+            now = time.monotonic()
+            if now - progress['saved_at'] >= STATE_SAVE_INTERVAL:
+                progress['saved_at'] = now
+                save_state(state_path, state)
+        if throttle:
+            throttle(length)
+        if progress_callback:
+            progress_callback(downloaded, total_size)
+
+    def fetch(f, index):
+        start, end = ranges[index]
+        offset = start + done[index]
+        with open_url(url, headers, ssl_context, (offset, end)) as response:
+            if response.status != 206:
+                raise IOError('Sunucu bayt aralığını döndürmedi')
+            f.seek(offset)
+            remaining = end - offset + 1
+            while remaining > 0:
+                if errors:
+                    return
+                chunk = response.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise IOError('Bağlantı erken kapandı')
+                f.write(chunk)
+                remaining -= len(chunk)
+                report(index, len(chunk))
+
+    def worker():
+        try:
+            # Tamponsuz yazılır; kaydedilen durum diske geçmemiş veriyi göstermez
+            with open(part_path, 'r+b', buffering=0) as f:
+                while not errors:
+                    try:
+                        index = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    fetch(f, index)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, daemon=True)
+               for _ in range(max(1, min(connections, pending.qsize())))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        save_state(state_path, state)
+        raise errors[0]
+
+    os.replace(part_path, target_path)
+    os.remove(state_path)
+    return total_size
@@ -0,0 +1,133 @@
+import os
+import re
+import threading
+import urllib.request
+from collections import OrderedDict
+
+THUMBNAIL_DIR = 'thumbnails'
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+MAX_THUMBNAIL_BYTES = 2 * 1024 * 1024
+PREFERRED_WIDTH = 320
+TIMEOUT = 15
+
+def pick_thumbnail(info):
+    """Liste görünümüne yetecek en küçük küçük resmin adresini döndürür"""
+    thumbnails = [t for t in info.get('thumbnails') or [] if t.get('url')]
+    # webp her Qt kurulumunda açılamadığı için jpg tercih edilir
+    jpeg = [t for t in thumbnails if '.jpg' in t['url']]
+    if jpeg:
+        thumbnails = jpeg
+
+    sized = [t for t in thumbnails if t.get('width')]
+    large_enough = [t for t in sized if t['width'] >= PREFERRED_WIDTH]
+    if large_enough:
+        return min(large_enough, key=lambda t: t['width'])['url']
+    if sized:
+        return max(sized, key=lambda t: t['width'])['url']
+    if info.get('thumbnail'):
+        return info['thumbnail']
+    return thumbnails[-1]['url'] if thumbnails else None
+
+class ThumbnailStore:
+    """Küçük resimleri video kimliğiyle diskte saklar.
+
+    Toplam boyut max_bytes'ı aşınca en uzun süredir kullanılmayan dosyalar
+    silinir. Erişim sırası dosyaların değiştirilme zamanında tutulur, böylece
+    uygulama yeniden açıldığında da korunur.
+    """
+
+    def __init__(self, directory=THUMBNAIL_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries = None
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def path(self, video_id):
+        """Video kimliğinin dosya yolunu, kimlik geçersizse None döndürür"""
+        if not video_id or not re.fullmatch(r'[\w-]+', video_id):
+            return None
+        return os.path.join(self.directory, f'{video_id}.jpg')
+
+    def _index(self):
+        if self._entries is None:
+            self._entries = OrderedDict()
+            self._total = 0
+            try:
+                files = [entry for entry in os.scandir(self.directory)
+                         if entry.is_file() and entry.name.endswith('.jpg')]
+            except FileNotFoundError:
+                files = []
+            for entry in sorted(files, key=lambda entry: entry.stat().st_mtime):
+                size = entry.stat().st_size
+                self._entries[entry.name[:-4]] = size
+                self._total += size
+        return self._entries
+
+    def get(self, video_id):
+        """Kayıtlı küçük resmin yolunu döndürür ve son kullanım zamanını günceller"""
+        path = self.path(video_id)
+        if not path:
+            return None
+        with self._lock:
+            entries = self._index()
+            if video_id not in entries:
+                return None
+            entries.move_to_end(video_id)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._forget(video_id)
+            return None
+        return path
+
+    def save(self, video_id, data):
+        """Küçük resmi kaydeder, gerekirse eski dosyaları siler"""
+        path = self.path(video_id)
+        if not path or not data:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            entries = self._index()
+            self._forget(video_id)
+            entries[video_id] = len(data)
+            self._total += len(data)
+            self._evict()
+        return path
+
+    def fetch(self, video_id, info, headers=None):
+        """Küçük resim kayıtlı değilse video bilgisindeki adresten indirip kaydeder"""
+        existing = self.get(video_id)
+        if existing:
+            return existing
+        url = pick_thumbnail(info)
+        if not url or not self.path(video_id):
+            return None
+
+        request = urllib.request.Request(url, headers=dict(headers or {}))
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+            data = response.read(MAX_THUMBNAIL_BYTES + 1)
+        if len(data) > MAX_THUMBNAIL_BYTES:
+            return None
+        return self.save(video_id, data)
+
+    def _forget(self, video_id):
+        size = self._index().pop(video_id, None)
+        if size is not None:
+            self._total -= size
+
+    def _evict(self):
+        entries = self._index()
+        while self._total > self.max_bytes and len(entries) > 1:
+            video_id, size = entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(self.path(video_id))
+            except OSError:
+                pass
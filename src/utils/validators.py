@@ -40,4 +40,28 @@ def validate_youtube_url(url):
         r'^https?://(?:www\.)?youtube\.com/embed/[\w-]+'
     ]
     
-    return any(bool(re.match(pattern, url)) for pattern in patterns) 
\ No newline at end of file
+    return any(bool(re.match(pattern, url)) for pattern in patterns)
+
+def validate_youtube_collection_url(url):
+    """YouTube oynatma listesi veya kanal URL'sini doğrular"""
+    patterns = [
+        r'^https?://(?:www\.|m\.)?youtube\.com/playlist\?(?:.*&)?list=[\w-]+',
+        r'^https?://(?:www\.|m\.)?youtube\.com/@[\w.-]+',
+        r'^https?://(?:www\.|m\.)?youtube\.com/(?:channel|c|user)/[\w-]+'
+    ]
+    
+    return any(bool(re.match(pattern, url)) for pattern in patterns)
+
+def extract_video_id(url):
+    """YouTube URL'sinden video kimliğini çıkarır, bulunamazsa None döner"""
+    patterns = [
+        r'^https?://(?:www\.|m\.)?youtube\.com/watch\?(?:.*&)?v=([\w-]{11})',
+        r'^https?://(?:www\.)?youtube\.com/(?:v|embed|shorts)/([\w-]{11})',
+        r'^https?://youtu\.be/([\w-]{11})'
+    ]
+    
+    for pattern in patterns:
+        match = re.match(pattern, url)
+        if match:
+            return match.group(1)
+    return None
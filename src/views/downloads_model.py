@@ -0,0 +1,156 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, pyqtSignal
+from PyQt5.QtGui import QColor
+from src.controllers.download_controller import DEFAULT_PAGE_SIZE
+from src.utils.file_utils import format_size
+
+class DownloadHistorySignals(QObject):
+    """Geçmiş kaydı değişikliklerini GUI thread'ine sinyal olarak taşır"""
+    changed = pyqtSignal(str, object)
+
+    def __init__(self, download_controller, parent=None):
+        super().__init__(parent)
+        self.download_controller = download_controller
+        self.download_controller.add_listener(self.dispatch)
+
+    def dispatch(self, event, download):
+        self.changed.emit(event, download)
+
+class DownloadsTableModel(QAbstractTableModel):
+    """İndirme geçmişini veritabanından sayfa sayfa okuyan tablo modeli.
+
+    Görünüm listenin sonuna yaklaştıkça canFetchMore/fetchMore ile bir
+    sonraki sayfa istenir. Hücre metinleri saklanmaz, yalnızca görünen
+    satırlar için data() içinde üretilir. Kayıt eklenip silindiğinde liste
+    yeniden yüklenmez, DownloadController olaylarıyla yalnızca ilgili satır
+    değişir.
+    """
+
+    HEADERS = ['Başlık', 'Format', 'Boyut', 'Durum', 'Tarih']
+
+    def __init__(self, download_controller, thumbnail_loader=None,
+                 page_size=DEFAULT_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.download_controller = download_controller
+        self.thumbnail_loader = thumbnail_loader
+        self.page_size = page_size
+        self.user_id = None
+        self.downloads = []
+        self.cursor = None
+        self.has_more = False
+        self.signals = DownloadHistorySignals(download_controller, self)
+        self.signals.changed.connect(self.apply_change)
+        if thumbnail_loader:
+            thumbnail_loader.thumbnail_ready.connect(self.refresh_thumbnails)
+
+    def set_user(self, user_id):
+        """Listeyi verilen kullanıcı için baştan yükler"""
+        self.beginResetModel()
+        self.user_id = user_id
+        self.downloads = []
+        self.cursor = None
+        self.has_more = user_id is not None
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.downloads)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.has_more
+
+    def fetchMore(self, parent):
+        if parent.isValid() or not self.has_more:
+            return
+        page, self.cursor = self.download_controller.get_user_downloads_page(
+            self.user_id, self.page_size, self.cursor)
+        self.has_more = self.cursor is not None
+        if not page:
+            return
+        start = len(self.downloads)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self.downloads.extend(page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        download = self.downloads[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return download.title
+            if column == 1:
+                return 'Video' if download.file_type == 'video' else 'Ses'
+            if column == 2:
+                # Boyut indirme tamamlanırken kaydedilir; eski kayıtlarda bilinmez
+                return format_size(download.file_size) if download.file_size else '-'
+            if column == 3:
+                return 'Tamamlandı'
+            if column == 4:
+                return download.download_date
+        elif role == Qt.DecorationRole and column == 0 and self.thumbnail_loader:
+            return self.thumbnail_loader.pixmap(download.video_id)
+        elif role == Qt.TextAlignmentRole and column > 0:
+            return Qt.AlignCenter
+        elif role == Qt.ForegroundRole and column == 3:
+            return QColor('#4CAF50')
+        elif role == Qt.UserRole:
+            return download
+        return None
+
+    def download_at(self, row):
+        """Satırdaki Download nesnesini döndürür"""
+        if 0 <= row < len(self.downloads):
+            return self.downloads[row]
+        return None
+
+    def row_of(self, download_id):
+        """Kaydın yüklenmiş satır numarasını, yoksa None döndürür"""
+        for row, download in enumerate(self.downloads):
+            if download.id == download_id:
+                return row
+        return None
+
+    def apply_change(self, event, download):
+        """DownloadController olayını listeye satır düzeyinde uygular"""
+        if event == 'failed' or self.user_id is None or download.user_id != self.user_id:
+            return
+
+        if event == 'inserted':
+            # Liste yeniden eskiye sıralı; yeni kayıt çoğunlukla en üste girer
+            key = (download.download_date or '', download.id)
+            row = 0
+            while row < len(self.downloads) and \
+                    (self.downloads[row].download_date or '', self.downloads[row].id) > key:
+                row += 1
+            if row == len(self.downloads) and self.has_more:
+                # Henüz yüklenmemiş sayfaya düşüyor, sırası gelince gelecek
+                return
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.downloads.insert(row, download)
+            self.endInsertRows()
+            return
+
+        row = self.row_of(download.id)
+        if row is None:
+            return
+        if event == 'deleted':
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.downloads[row]
+            self.endRemoveRows()
+
+    def refresh_thumbnails(self, video_id):
+        # Görünüm yalnızca ekrandaki hücreleri yeniden çizer
+        if self.downloads:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.downloads) - 1, 0),
+                                  [Qt.DecorationRole])
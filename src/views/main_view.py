@@ -1,89 +1,107 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QPushButton, QComboBox, QProgressBar,
-                             QTableWidget, QTableWidgetItem, QMessageBox, QFileDialog,
+                             QTableWidget, QTableWidgetItem, QTableView, QMessageBox, QFileDialog,
                              QFrame, QGraphicsDropShadowEffect, QHeaderView, QStyle,
                              QGraphicsOpacityEffect, QMenu)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve, QPoint, QSize
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, QPropertyAnimation, QEasingCurve, QPoint, QSize
 from PyQt5.QtGui import QColor, QFont, QPalette, QIcon
-import yt_dlp
 import os
-from src.utils.validators import validate_youtube_url
-from src.utils.file_utils import get_file_size
-
-class DownloadThread(QThread):
-    progress = pyqtSignal(float)
-    finished = pyqtSignal(bool, str)
-    info = pyqtSignal(dict)
-
-    def __init__(self, url, download_path, format_id='best'):
-        super().__init__()
-        self.url = url
-        self.download_path = download_path
-        self.format_id = format_id
-
-    def progress_hook(self, d):
-        if d['status'] == 'downloading':
-            try:
-                total = d.get('total_bytes', 0) or d.get('total_bytes_estimate', 0)
-                downloaded = d.get('downloaded_bytes', 0)
-                if total > 0:
-                    progress = (downloaded / total) * 100
-                    self.progress.emit(progress)
-            except:
-                pass
-        elif d['status'] == 'finished':
-            self.progress.emit(100)
-
-    def run(self):
-        try:
-            ydl_opts = {
-                'format': self.format_id,
-                'outtmpl': os.path.join(self.download_path, '%(title)s.%(ext)s'),
-                'progress_hooks': [self.progress_hook],
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': False,
-                'nocheckcertificate': True,
-                'ignoreerrors': True,
-                'no_color': True,
-                'geo_bypass': True,
-                'cookies': None,
-                'http_headers': {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                }
-            }
-            
-            if self.format_id == 'bestaudio/best':
-                ydl_opts.update({
-                    'format': 'bestaudio/best',
-                    'postprocessors': [{
-                        'key': 'FFmpegExtractAudio',
-                        'preferredcodec': 'mp3',
-                        'preferredquality': '192',
-                    }],
-                })
-            else:
-                ydl_opts.update({
-                    'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
-                })
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(self.url, download=False)
-                if info:
-                    self.info.emit(info)
-                    ydl.download([self.url])
-                    self.finished.emit(True, '')
-                else:
-                    self.finished.emit(False, 'Video bilgileri alınamadı')
-        except Exception as e:
-            self.finished.emit(False, str(e))
+from src.utils.validators import validate_youtube_url, validate_youtube_collection_url
+from src.utils.file_utils import format_size
+from src.models.download_job import DownloadJob
+from src.views.thumbnail_loader import ThumbnailLoader, THUMBNAIL_SIZE
+from src.views.downloads_model import DownloadsTableModel
+
+class DownloadQueueSignals(QObject):
+    """İndirme kuyruğu olaylarını GUI thread'ine sinyal olarak taşır"""
+    job_added = pyqtSignal(object)
+    job_started = pyqtSignal(object)
+    job_info = pyqtSignal(object)
+    job_progress = pyqtSignal(int, dict)
+    job_processing = pyqtSignal(object)
+    job_preempted = pyqtSignal(object)
+    job_retrying = pyqtSignal(object)
+    job_paused = pyqtSignal(object)
+    job_resumed = pyqtSignal(object)
+    job_finished = pyqtSignal(object)
+
+    def __init__(self, download_queue, parent=None):
+        super().__init__(parent)
+        self.download_queue = download_queue
+        self.download_queue.add_listener(self.dispatch)
+
+    def dispatch(self, event, job):
+        if event == 'added':
+            self.job_added.emit(job)
+        elif event == 'started':
+            self.job_started.emit(job)
+        elif event == 'info':
+            self.job_info.emit(job)
+        elif event == 'progress':
+            self.job_progress.emit(job.id, job.progress_snapshot())
+        elif event == 'processing':
+            self.job_processing.emit(job)
+        elif event == 'preempted':
+            self.job_preempted.emit(job)
+        elif event == 'retrying':
+            self.job_retrying.emit(job)
+        elif event == 'paused':
+            self.job_paused.emit(job)
+        elif event == 'resumed':
+            self.job_resumed.emit(job)
+        elif event == 'finished':
+            self.job_finished.emit(job)
+
+RATE_LIMITS = [
+    ('Sınırsız', 0),
+    ('1 MB/s', 1024 * 1024),
+    ('2 MB/s', 2 * 1024 * 1024),
+    ('5 MB/s', 5 * 1024 * 1024),
+    ('10 MB/s', 10 * 1024 * 1024)
+]
+
+PRIORITIES = [
+    ('Normal', 0),
+    ('Yüksek', 10),
+    ('Düşük', -10)
+]
+
+def format_progress(snapshot):
+    """İlerleme özetini yüzde, hız ve kalan süre olarak biçimlendirir"""
+    parts = [f"{int(snapshot['percent'])}%"]
+    if snapshot.get('speed'):
+        parts.append(f"{format_size(snapshot['speed'])}/s")
+    if snapshot.get('eta') is not None:
+        minutes, seconds = divmod(int(snapshot['eta']), 60)
+        parts.append(f'{minutes:02d}:{seconds:02d}')
+    return ' · '.join(parts)
 
 class MainView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
-        self.download_thread = None
+        self.job_rows = {}
+        self.job_percents = {}
+        self.thumbnail_loader = ThumbnailLoader(self.parent.thumbnail_store, parent=self)
+        self.downloads_model = DownloadsTableModel(self.parent.download_controller,
+                                                   self.thumbnail_loader, parent=self)
+        # Silme sonucu yazım kalıcı olunca geçmiş olaylarıyla bildirilir
+        self.pending_deletes = set()
+        self.downloads_model.signals.changed.connect(self.history_changed)
         self.init_ui()
+
+        # İndirme kuyruğu sinyalleri
+        self.queue_signals = DownloadQueueSignals(self.parent.download_queue, self)
+        self.queue_signals.job_added.connect(self.add_job_row)
+        self.queue_signals.job_started.connect(self.update_job_row)
+        self.queue_signals.job_info.connect(self.update_job_row)
+        self.queue_signals.job_progress.connect(self.update_progress)
+        self.queue_signals.job_processing.connect(self.update_job_row)
+        self.queue_signals.job_preempted.connect(self.update_job_row)
+        self.queue_signals.job_retrying.connect(self.update_job_row)
+        self.queue_signals.job_paused.connect(self.update_job_row)
+        self.queue_signals.job_resumed.connect(self.update_job_row)
+        self.queue_signals.job_finished.connect(self.download_finished)
         
     def init_ui(self):
         """Ana ekran arayüzünü oluşturur"""
@@ -249,7 +267,7 @@ class MainView(QWidget):
         url_layout = QHBoxLayout()
         url_label = QLabel('Video URL:')
         self.url_input = QLineEdit()
-        self.url_input.setPlaceholderText('YouTube video URL\'sini girin')
+        self.url_input.setPlaceholderText('YouTube video, oynatma listesi veya kanal URL\'sini girin')
         self.url_input.textChanged.connect(self.validate_url)
         url_layout.addWidget(url_label)
         url_layout.addWidget(self.url_input)
@@ -263,12 +281,51 @@ class MainView(QWidget):
         format_layout = QVBoxLayout()
         format_label = QLabel('Format:')
         self.format_combo = QComboBox()
-        self.format_combo.addItems(['Video (En İyi Kalite)', 'Sadece Ses (MP3)'])
+        self.format_combo.addItems(['Video (En İyi Kalite)', 'Sadece Ses (MP3)',
+                                    'Sadece Ses (MP3, ara dosyasız)'])
+        self.format_combo.setItemData(2, 'Ses indirilirken doğrudan MP3\'e dönüştürülür; '
+                                         'diskte iki kat yer gerekmez ama yarıda kalırsa '
+                                         'baştan indirilir', Qt.ToolTipRole)
         self.format_combo.setCursor(Qt.PointingHandCursor)
         format_layout.addWidget(format_label)
         format_layout.addWidget(self.format_combo)
         options_layout.addLayout(format_layout)
         
+        # Bağlantı sayısı (progresif formatlarda paralel bayt aralıkları)
+        connections_layout = QVBoxLayout()
+        connections_label = QLabel('Bağlantı:')
+        self.connections_combo = QComboBox()
+        self.connections_combo.addItems(['1', '2', '4', '8'])
+        self.connections_combo.setToolTip('Birden fazla bağlantı seçilirse video tek dosyalık '
+                                          '(progresif) formatta, paralel parçalar halinde indirilir')
+        self.connections_combo.setCursor(Qt.PointingHandCursor)
+        connections_layout.addWidget(connections_label)
+        connections_layout.addWidget(self.connections_combo)
+        options_layout.addLayout(connections_layout)
+        
+        # Öncelik: işçiler doluysa yüksek öncelikli iş düşük olanı bekletir
+        priority_layout = QVBoxLayout()
+        priority_label = QLabel('Öncelik:')
+        self.priority_combo = QComboBox()
+        for text, priority in PRIORITIES:
+            self.priority_combo.addItem(text, priority)
+        self.priority_combo.setCursor(Qt.PointingHandCursor)
+        priority_layout.addWidget(priority_label)
+        priority_layout.addWidget(self.priority_combo)
+        options_layout.addLayout(priority_layout)
+        
+        # Tüm indirmeler için ortak hız sınırı
+        rate_layout = QVBoxLayout()
+        rate_label = QLabel('Hız Sınırı:')
+        self.rate_combo = QComboBox()
+        for text, rate in RATE_LIMITS:
+            self.rate_combo.addItem(text, rate)
+        self.rate_combo.setCursor(Qt.PointingHandCursor)
+        self.rate_combo.currentIndexChanged.connect(self.change_rate_limit)
+        rate_layout.addWidget(rate_label)
+        rate_layout.addWidget(self.rate_combo)
+        options_layout.addLayout(rate_layout)
+        
         # İndirme konumu
         path_layout = QVBoxLayout()
         path_label = QLabel('Konum:')
@@ -301,10 +358,33 @@ class MainView(QWidget):
         self.progress_bar.setTextVisible(True)
         self.progress_bar.setFormat('%p%')
         
+        self.clear_queue_button = QPushButton('Temizle')
+        self.clear_queue_button.setObjectName('browseButton')
+        self.clear_queue_button.setCursor(Qt.PointingHandCursor)
+        self.clear_queue_button.clicked.connect(self.clear_finished_jobs)
+
         download_layout_bottom.addWidget(self.download_button)
         download_layout_bottom.addWidget(self.progress_bar)
+        download_layout_bottom.addWidget(self.clear_queue_button)
         download_layout.addLayout(download_layout_bottom)
-        
+
+        # İndirme kuyruğu tablosu
+        self.queue_table = QTableWidget()
+        self.queue_table.setColumnCount(4)
+        self.queue_table.setHorizontalHeaderLabels(['Video', 'Format', 'İlerleme', 'Durum'])
+        self.queue_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.queue_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.queue_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        self.queue_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        self.queue_table.verticalHeader().setVisible(False)
+        self.queue_table.setShowGrid(False)
+        self.queue_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.queue_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.queue_table.setMaximumHeight(150)
+        self.queue_table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.queue_table.customContextMenuRequested.connect(self.show_queue_context_menu)
+        download_layout.addWidget(self.queue_table)
+
         main_layout.addWidget(download_panel)
         
         # İndirme listesi paneli
@@ -371,9 +451,8 @@ class MainView(QWidget):
         list_layout.addWidget(list_title)
         
         # İndirme listesi tablosu
-        self.downloads_table = QTableWidget()
-        self.downloads_table.setColumnCount(5)
-        self.downloads_table.setHorizontalHeaderLabels(['Başlık', 'Format', 'Boyut', 'Durum', 'Tarih'])
+        self.downloads_table = QTableView()
+        self.downloads_table.setModel(self.downloads_model)
         self.downloads_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.downloads_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.downloads_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
@@ -382,25 +461,29 @@ class MainView(QWidget):
         self.downloads_table.setAlternatingRowColors(True)
         self.downloads_table.setShowGrid(False)
         self.downloads_table.verticalHeader().setVisible(False)
-        self.downloads_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.downloads_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.downloads_table.setSelectionBehavior(QTableView.SelectRows)
+        self.downloads_table.setSelectionMode(QTableView.SingleSelection)
+        self.downloads_table.setIconSize(THUMBNAIL_SIZE)
+        self.downloads_table.verticalScrollBar().valueChanged.connect(self.load_visible_thumbnails)
+        self.downloads_model.rowsInserted.connect(self.load_visible_thumbnails)
+        self.downloads_model.rowsRemoved.connect(self.load_visible_thumbnails)
         self.downloads_table.setStyleSheet('''
-            QTableWidget {
+            QTableView {
                 border: none;
                 background-color: white;
                 gridline-color: transparent;
                 font-family: "Segoe UI", Arial;
                 font-size: 13px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 12px;
                 border-bottom: 1px solid #f0f0f0;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e3f2fd;
                 color: #1976D2;
             }
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background-color: #f5f5f5;
             }
             QHeaderView::section {
@@ -513,10 +596,13 @@ class MainView(QWidget):
             if hasattr(panel, 'pos_anim'):
                 panel.pos_anim.setEndValue(panel.pos())
 
+        if hasattr(self, 'downloads_table'):
+            self.load_visible_thumbnails()
+
     def validate_url(self):
         """URL'yi doğrular"""
         url = self.url_input.text().strip()
-        is_valid = validate_youtube_url(url)
+        is_valid = validate_youtube_url(url) or validate_youtube_collection_url(url)
         
         self.url_input.setStyleSheet(f'''
             QLineEdit {{
@@ -540,6 +626,10 @@ class MainView(QWidget):
         if path:
             self.path_input.setText(path)
 
+    def change_rate_limit(self, index):
+        """Ortak hız sınırını değiştirir, çalışan indirmeler de etkilenir"""
+        self.parent.bandwidth_governor.set_rate(self.rate_combo.itemData(index))
+
     def start_download(self):
         """İndirme işlemini başlatır"""
         url = self.url_input.text().strip()
@@ -554,81 +644,168 @@ class MainView(QWidget):
             return
         
         # Format seçimi
-        format_id = 'bestaudio/best' if self.format_combo.currentIndex() == 1 else 'best'
-        
-        # İndirme thread'ini başlat
-        self.download_button.setEnabled(False)
-        self.progress_bar.setValue(0)
-        
-        self.download_thread = DownloadThread(url, download_path, format_id)
-        self.download_thread.progress.connect(self.update_progress)
-        self.download_thread.finished.connect(self.download_finished)
-        self.download_thread.info.connect(self.save_download_info)
-        self.download_thread.start()
+        format_id = 'bestaudio/best' if self.format_combo.currentIndex() in (1, 2) else 'best'
+        stream_audio = self.format_combo.currentIndex() == 2
 
-    def update_progress(self, progress):
-        """İndirme ilerlemesini günceller"""
-        self.progress_bar.setValue(int(progress))
+        connections = int(self.connections_combo.currentText())
+        priority = self.priority_combo.currentData()
 
-    def download_finished(self, success, error):
-        """İndirme tamamlandığında çağrılır"""
-        self.download_button.setEnabled(True)
-        
-        if success:
-            self.show_success_message('İndirme işlemi tamamlandı!')
-            self.url_input.clear()
-            self.update_downloads_table()
+        # Oynatma listesi ve kanallar keşfedildikçe kuyruğa eklenir
+        if validate_youtube_collection_url(url):
+            submit = self.parent.download_queue.submit_collection
         else:
-            self.show_error_message(f'İndirme başarısız: {error}')
+            submit = self.parent.download_queue.submit
 
-    def save_download_info(self, info):
-        """İndirme bilgilerini veritabanına kaydeder"""
-        title = info.get('title', 'Bilinmeyen')
-        url = self.url_input.text()
-        file_path = self.path_input.text()
-        file_type = 'audio' if self.format_combo.currentIndex() == 1 else 'video'
-        
-        self.parent.download_controller.add_download(
-            self.parent.current_user['id'],
-            title,
+        # İşi kuyruğa ekle
+        submit(
             url,
-            file_path,
-            file_type
+            download_path,
+            format_id,
+            self.parent.current_user['id'],
+            connections=connections,
+            priority=priority,
+            stream_audio=stream_audio
         )
+        self.url_input.clear()
+
+    def add_job_row(self, job):
+        """Kuyruğa eklenen iş için satır oluşturur"""
+        row = self.queue_table.rowCount()
+        self.queue_table.insertRow(row)
+        self.job_rows[job.id] = row
+
+        title_item = QTableWidgetItem(job.title)
+        title_item.setData(Qt.UserRole, job.id)
+        self.queue_table.setItem(row, 0, title_item)
+
+        format_item = QTableWidgetItem('Video' if job.file_type == 'video' else 'Ses')
+        format_item.setTextAlignment(Qt.AlignCenter)
+        self.queue_table.setItem(row, 1, format_item)
+
+        progress_item = QTableWidgetItem('0%')
+        progress_item.setTextAlignment(Qt.AlignCenter)
+        self.queue_table.setItem(row, 2, progress_item)
+
+        status_item = QTableWidgetItem()
+        status_item.setTextAlignment(Qt.AlignCenter)
+        self.queue_table.setItem(row, 3, status_item)
+
+        self.update_job_row(job)
+
+    def update_job_row(self, job):
+        """İş satırındaki başlık ve durum bilgisini günceller"""
+        row = self.job_rows.get(job.id)
+        if row is None:
+            return
+
+        self.queue_table.item(row, 0).setText(job.title)
+        self.queue_table.item(row, 2).setText(format_progress(job.progress_snapshot()))
+
+        status_texts = {
+            DownloadJob.QUEUED: ('Sırada', '#757575'),
+            DownloadJob.RUNNING: ('İndiriliyor', '#2196F3'),
+            DownloadJob.PAUSED: ('Duraklatıldı', '#757575'),
+            DownloadJob.PROCESSING: ('İşleniyor', '#FF9800'),
+            DownloadJob.COMPLETED: ('Tamamlandı', '#4CAF50'),
+            DownloadJob.FAILED: ('Başarısız', '#f44336'),
+            DownloadJob.SKIPPED: ('Zaten indirildi', '#9E9E9E'),
+            DownloadJob.CANCELLED: ('İptal edildi', '#9E9E9E')
+        }
+        text, color = status_texts.get(job.state, (job.state, '#424242'))
+        if job.state == DownloadJob.QUEUED and job.retry_at:
+            text, color = 'Tekrar denenecek', '#FF9800'
+        elif job.state == DownloadJob.RUNNING and job.pause_requested:
+            text = 'Duraklatılıyor'
+        elif job.state == DownloadJob.RUNNING and job.cancel_requested:
+            text = 'İptal ediliyor'
+        elif job.state == DownloadJob.SKIPPED and job.duplicate_of:
+            text = 'Zaten kuyrukta'
+        status_item = self.queue_table.item(row, 3)
+        status_item.setText(text)
+        status_item.setForeground(QColor(color))
+        status_item.setToolTip(job.error)
+
+    def update_progress(self, job_id, snapshot):
+        """İndirme ilerlemesini günceller"""
+        row = self.job_rows.get(job_id)
+        if row is not None:
+            self.queue_table.item(row, 2).setText(format_progress(snapshot))
+
+        # Genel ilerleme yalnızca tam sayı yüzdesi değiştiğinde yeniden hesaplanır
+        percent = int(snapshot['percent'])
+        if self.job_percents.get(job_id) != percent:
+            self.job_percents[job_id] = percent
+            self.update_overall_progress()
+
+    def update_overall_progress(self):
+        """Aktif işlerin ortalama ilerlemesini gösterir"""
+        jobs = self.parent.download_queue.active_jobs()
+        if jobs:
+            self.progress_bar.setValue(int(sum(job.progress for job in jobs) / len(jobs)))
+        else:
+            self.progress_bar.setValue(100 if self.job_rows else 0)
+
+    def download_finished(self, job):
+        """İndirme tamamlandığında çağrılır"""
+        self.update_job_row(job)
+        self.update_overall_progress()
+
+        if job.state == DownloadJob.COMPLETED:
+            # Yeni satır DownloadController olayıyla listeye eklenir
+            self.thumbnail_loader.invalidate(job.video_id)
+            self.save_download_info(job)
+
+    def save_download_info(self, job):
+        """İndirme bilgilerini veritabanına kaydeder"""
+        self.parent.download_controller.add_job_download(job)
+
+    def clear_finished_jobs(self):
+        """Sonlanan işleri kuyruk tablosundan kaldırır"""
+        self.parent.download_queue.clear_finished()
+
+        for row in reversed(range(self.queue_table.rowCount())):
+            job_id = self.queue_table.item(row, 0).data(Qt.UserRole)
+            if self.parent.download_queue.get_job(job_id) is None:
+                self.queue_table.removeRow(row)
+
+        self.job_rows = {
+            self.queue_table.item(row, 0).data(Qt.UserRole): row
+            for row in range(self.queue_table.rowCount())
+        }
+        self.job_percents = {
+            job_id: percent for job_id, percent in self.job_percents.items()
+            if job_id in self.job_rows
+        }
+        self.update_overall_progress()
 
     def update_downloads_table(self):
-        """İndirme listesini günceller"""
+        """İndirme listesini baştan yükler, satırlar kaydırdıkça sayfa sayfa gelir"""
         if hasattr(self.parent, 'current_user') and self.parent.current_user:
-            downloads = self.parent.download_controller.get_user_downloads(self.parent.current_user['id'])
-            self.downloads_table.setRowCount(len(downloads))
-            
-            for i, download in enumerate(downloads):
-                # Başlık
-                title_item = QTableWidgetItem(download.title)
-                title_item.setData(Qt.UserRole, download.id)
-                self.downloads_table.setItem(i, 0, title_item)
-                
-                # Format
-                format_item = QTableWidgetItem('Video' if download.file_type == 'video' else 'Ses')
-                format_item.setTextAlignment(Qt.AlignCenter)
-                self.downloads_table.setItem(i, 1, format_item)
-                
-                # Boyut
-                size = get_file_size(os.path.join(download.file_path, f"{download.title}.{'mp4' if download.file_type == 'video' else 'mp3'}"))
-                size_item = QTableWidgetItem(size)
-                size_item.setTextAlignment(Qt.AlignCenter)
-                self.downloads_table.setItem(i, 2, size_item)
-                
-                # Durum
-                status_item = QTableWidgetItem('Tamamlandı')
-                status_item.setForeground(QColor('#4CAF50'))
-                status_item.setTextAlignment(Qt.AlignCenter)
-                self.downloads_table.setItem(i, 3, status_item)
-                
-                # Tarih
-                date_item = QTableWidgetItem(download.download_date)
-                date_item.setTextAlignment(Qt.AlignCenter)
-                self.downloads_table.setItem(i, 4, date_item)
+            self.downloads_model.set_user(self.parent.current_user['id'])
+            self.load_visible_thumbnails()
+
+    def visible_download_rows(self):
+        """Geçmiş tablosunda ekranda görünen satır aralığını döndürür"""
+        table = self.downloads_table
+        row_count = self.downloads_model.rowCount()
+        if row_count == 0:
+            return range(0)
+        first = table.rowAt(0)
+        last = table.rowAt(table.viewport().height() - 1)
+        if first < 0:
+            first = 0
+        if last < 0:
+            last = row_count - 1
+        return range(first, last + 1)
+
+    def load_visible_thumbnails(self):
+        """Küçük resim yüklemesini görünen satırlarla sınırlar"""
+        video_ids = []
+        for row in self.visible_download_rows():
+            download = self.downloads_model.download_at(row)
+            if download and download.video_id:
+                video_ids.append(download.video_id)
+        self.thumbnail_loader.set_visible(video_ids)
 
     def update_user_info(self):
         """Kullanıcı bilgisini günceller ve ekranı yeniler"""
@@ -716,10 +893,10 @@ class MainView(QWidget):
         self.parent.logout()
         self.url_input.clear()
         self.progress_bar.setValue(0)
-        self.downloads_table.setRowCount(0)
+        self.downloads_model.set_user(None)
 
-    def show_context_menu(self, position):
-        """Sağ tık menüsünü gösterir"""
+    def create_menu(self):
+        """Uygulama stiliyle sağ tık menüsü oluşturur"""
         menu = QMenu()
         menu.setStyleSheet('''
             QMenu {
@@ -745,6 +922,48 @@ class MainView(QWidget):
                 margin: 5px 15px;
             }
         ''')
+        return menu
+
+    def show_queue_context_menu(self, position):
+        """Kuyruktaki iş için duraklat, devam et ve iptal menüsünü gösterir"""
+        item = self.queue_table.itemAt(position)
+        if item is None:
+            return
+        job_id = self.queue_table.item(item.row(), 0).data(Qt.UserRole)
+        job = self.parent.download_queue.get_job(job_id)
+        if job is None or job.is_finished():
+            return
+
+        download_queue = self.parent.download_queue
+        menu = self.create_menu()
+        if job.state == DownloadJob.PAUSED or job.pause_requested:
+            resume_action = menu.addAction('Devam Et')
+            resume_action.triggered.connect(lambda: self.change_job(download_queue.resume, job_id))
+        elif job.state == DownloadJob.RUNNING and not job.resumable:
+            # Ses akışı yarım dosya bırakmaz; duraklatılırsa baştan inmesi gerekir
+            pause_action = menu.addAction('Duraklat (ses akışında kullanılamaz)')
+            pause_action.setEnabled(False)
+        elif job.state in (DownloadJob.QUEUED, DownloadJob.RUNNING):
+            pause_action = menu.addAction('Duraklat')
+            pause_action.triggered.connect(lambda: self.change_job(download_queue.pause, job_id))
+        if job.state != DownloadJob.PROCESSING:
+            menu.addSeparator()
+            cancel_action = menu.addAction('İptal Et')
+            cancel_action.triggered.connect(lambda: self.change_job(download_queue.cancel, job_id))
+
+        if not menu.isEmpty():
+            menu.exec_(self.queue_table.viewport().mapToGlobal(position))
+
+    def change_job(self, action, job_id):
+        """Kuyruk işlemini uygular ve satırı hemen günceller"""
+        if action(job_id):
+            job = self.parent.download_queue.get_job(job_id)
+            if job:
+                self.update_job_row(job)
+
+    def show_context_menu(self, position):
+        """Sağ tık menüsünü gösterir"""
+        menu = self.create_menu()
 
         row = self.downloads_table.rowAt(position.y())
         if row >= 0:
@@ -758,9 +977,9 @@ class MainView(QWidget):
 
     def open_download_folder(self, row):
         """İndirilen dosyanın klasörünü açar"""
-        file_path = self.downloads_table.item(row, 2).text()
-        folder_path = os.path.dirname(file_path)
-        os.startfile(folder_path)
+        download = self.downloads_model.download_at(row)
+        if download:
+            os.startfile(download.file_path)
 
     def delete_download(self, row):
         """İndirme kaydını siler"""
@@ -773,13 +992,23 @@ class MainView(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            download_id = self.downloads_table.item(row, 0).data(Qt.UserRole)
-            if self.parent.download_controller.delete_download(download_id):
-                self.downloads_table.removeRow(row)
-                self.show_success_message('İndirme kaydı başarıyla silindi.')
-            else:
+            download_id = self.downloads_model.download_at(row).id
+            self.pending_deletes.add(download_id)
+            if not self.parent.download_controller.delete_download(
+                    download_id, self.parent.current_user['id']):
+                self.pending_deletes.discard(download_id)
                 self.show_error_message('İndirme kaydı silinirken bir hata oluştu.')
 
+    def history_changed(self, event, download):
+        """Bekleyen silme işleminin sonucunu gösterir"""
+        if download.id not in self.pending_deletes or event not in ('deleted', 'failed'):
+            return
+        self.pending_deletes.discard(download.id)
+        if event == 'deleted':
+            self.show_success_message('İndirme kaydı başarıyla silindi.')
+        else:
+            self.show_error_message('İndirme kaydı silinirken bir hata oluştu.')
+
     def show_login(self):
         """Giriş ekranını gösterir"""
         from src.views.login_view import LoginView
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+THUMBNAIL_SIZE = QSize(64, 36)
+DEFAULT_MEMORY_ENTRIES = 300
+
+class ThumbnailSignals(QObject):
+    """Arka plan görevinden GUI thread'ine sonuç taşır"""
+    decoded = pyqtSignal(str, QImage)
+    skipped = pyqtSignal(str)
+
+class ThumbnailTask(QRunnable):
+    """Küçük resmi diskten okuyup ölçekler; QPixmap GUI thread'inde oluşturulur"""
+
+    def __init__(self, loader, video_id):
+        super().__init__()
+        self.loader = loader
+        self.video_id = video_id
+
+    def run(self):
+        loader = self.loader
+        # Kullanıcı hızlı kaydırdıysa artık görünmeyen satır çözülmez
+        wanted = loader.wanted
+        if wanted is not None and self.video_id not in wanted:
+            loader.signals.skipped.emit(self.video_id)
+            return
+
+        image = QImage()
+        path = loader.store.get(self.video_id)
+        if path and image.load(path):
+            image = image.scaled(loader.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        loader.signals.decoded.emit(self.video_id, image)
+
+class ThumbnailLoader(QObject):
+    """Küçük resimleri arka planda yükler ve QPixmap'leri bellekte LRU olarak tutar.
+
+    pixmap() önbellekte olmayan resim için None döndürür ve yüklemeyi
+    başlatır; resim hazır olunca thumbnail_ready yayınlanır.
+    """
+
+    thumbnail_ready = pyqtSignal(str)
+
+    def __init__(self, store, size=THUMBNAIL_SIZE, max_entries=DEFAULT_MEMORY_ENTRIES,
+                 parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.size = size
+        self.max_entries = max_entries
+        self.wanted = None
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self.signals = ThumbnailSignals()
+        self.signals.decoded.connect(self.on_decoded)
+        self.signals.skipped.connect(self.on_skipped)
+        self._pixmaps = OrderedDict()
+        self._pending = set()
+        self._missing = set()
+
+    def pixmap(self, video_id):
+        """Önbellekteki küçük resmi döndürür, yoksa yüklemeyi başlatıp None döndürür"""
+        if not video_id or video_id in self._missing:
+            return None
+        pixmap = self._pixmaps.get(video_id)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(video_id)
+            return pixmap
+        if video_id not in self._pending:
+            self._pending.add(video_id)
+            self.pool.start(ThumbnailTask(self, video_id))
+        return None
+
+    def set_visible(self, video_ids):
+        """Yalnızca görünen satırların resimlerinin yüklenmesini sağlar"""
+        self.wanted = frozenset(video_ids)
+
+    def invalidate(self, video_id):
+        """Yeni kaydedilen resmin tekrar yüklenmesine izin verir"""
+        self._missing.discard(video_id)
+        self._pixmaps.pop(video_id, None)
+
+    def on_decoded(self, video_id, image):
+        self._pending.discard(video_id)
+        if image.isNull():
+            self._missing.add(video_id)
+            return
+        self._pixmaps[video_id] = QPixmap.fromImage(image)
+        while len(self._pixmaps) > self.max_entries:
+            self._pixmaps.popitem(last=False)
+        self.thumbnail_ready.emit(video_id)
+
+    def on_skipped(self, video_id):
+        self._pending.discard(video_id)
@@ -0,0 +1,57 @@
+"""Sayfa çözümleme sayısını sahte extractor'la ölçer.
+
+Eski akış (extract_info(download=False) ardından ydl.download) ile
+DownloadTask.run karşılaştırılır:
+
+    python tests/bench_extraction.py > bench_output.txt
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import yt_dlp
+from helpers import RangeServer, CountingIE, CountingYoutubeDL, VIDEO_URL
+from src.controllers.download_task import DownloadTask
+from src.models.download_job import DownloadJob
+
+JOBS = 20
+
+def two_pass(download_path):
+    """Tek geçişten önceki akış: bilgi ve indirme için ayrı çözümleme"""
+    options = {'outtmpl': os.path.join(download_path, '%(title)s.%(ext)s'), 'quiet': True,
+               'noprogress': True}
+    with yt_dlp.YoutubeDL(options) as ydl:
+        ydl.extract_info(VIDEO_URL, download=False)
+        ydl.download([VIDEO_URL])
+
+def single_pass(download_path, job_id):
+    DownloadTask(DownloadJob(job_id, VIDEO_URL, download_path, 'best')).run()
+
+def measure(name, run):
+    CountingIE.calls = 0
+    start = time.perf_counter()
+    for i in range(JOBS):
+        with tempfile.TemporaryDirectory() as download_path:
+            run(download_path, i + 1)
+    elapsed = time.perf_counter() - start
+    print(f'{name:<12} çözümleme/iş: {CountingIE.calls / JOBS:.2f}  '
+          f'süre/iş: {elapsed / JOBS * 1000:.1f} ms')
+    return CountingIE.calls / JOBS
+
+def main():
+    server = RangeServer(os.urandom(256 * 1024))
+    CountingIE.media_url = server.url
+    yt_dlp.YoutubeDL = CountingYoutubeDL
+    try:
+        before = measure('iki geçiş', lambda path, _: two_pass(path))
+        after = measure('tek geçiş', single_pass)
+        print(f'çözümleme oranı: {after / before:.2f}')
+    finally:
+        server.close()
+
+if __name__ == '__main__':
+    main()
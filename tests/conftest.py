@@ -0,0 +1,32 @@
+import os
+import sys
+import pytest
+import yt_dlp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers import RangeServer, CountingIE, CountingYoutubeDL
+
+@pytest.fixture
+def serve():
+    """Verilen baytları yerel HTTP sunucusundan sunar, sunucuyu döndürür"""
+    servers = []
+
+    def start(data, supports_range=True):
+        server = RangeServer(data, supports_range)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+@pytest.fixture
+def counting_ydl(monkeypatch, serve):
+    """DownloadTask'in YoutubeDL'ini sayaçlı sahte extractor'la değiştirir"""
+    server = serve(os.urandom(256 * 1024))
+    monkeypatch.setattr(CountingIE, 'media_url', server.url)
+    monkeypatch.setattr(CountingIE, 'calls', 0)
+    monkeypatch.setattr(CountingIE, 'separate', False)
+    monkeypatch.setattr(yt_dlp, 'YoutubeDL', CountingYoutubeDL)
+    return server
@@ -0,0 +1,127 @@
+import io
+import math
+import re
+import struct
+import threading
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import yt_dlp
+from yt_dlp.extractor.common import InfoExtractor
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+VIDEO_URL = f'https://www.youtube.com/watch?v={VIDEO_ID}'
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Bellekteki veriyi Range desteğiyle (isteğe bağlı) sunar"""
+
+    def do_GET(self):
+        server = self.server
+        data = server.data
+        byte_range = self.headers.get('Range')
+        with server.lock:
+            server.requests.append(byte_range)
+
+        match = re.match(r'bytes=(\d+)-(\d*)', byte_range or '')
+        if match and server.supports_range:
+            start = int(match.group(1))
+            end = min(int(match.group(2)) if match.group(2) else len(data) - 1, len(data) - 1)
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(data)}')
+                self.end_headers()
+                return
+            body = data[start:end + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(data)}')
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if server.fail_after is not None and len(body) > server.fail_after:
+            # Bağlantı yarıda kesilmiş gibi davranır
+            self.wfile.write(body[:server.fail_after])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class RangeServer(ThreadingHTTPServer):
+    """Testlerde kullanılan yerel HTTP sunucusu"""
+    daemon_threads = True
+
+    def __init__(self, data, supports_range=True):
+        super().__init__(('127.0.0.1', 0), RangeHandler)
+        self.data = data
+        self.supports_range = supports_range
+        self.fail_after = None
+        self.requests = []
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}/media'
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+def make_wav(seconds=1.0, rate=22050):
+    """ffmpeg'in çözebileceği kısa bir sinüs WAV verisi üretir"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b''.join(
+            struct.pack('<h', int(12000 * math.sin(2 * math.pi * 440 * i / rate)))
+            for i in range(int(seconds * rate))))
+    return buffer.getvalue()
+
+class CountingIE(InfoExtractor):
+    """Sayfa çözümlemesini sayan, formatı yerel sunucuya yönlendiren sahte extractor"""
+    IE_NAME = 'counting'
+    _VALID_URL = r'https?://(?:www\.)?youtube\.com/watch\?v=(?P<id>[\w-]{11})'
+
+    media_url = None
+    calls = 0
+    # True ise görüntü ve ses ayrı formatlar olarak döndürülür
+    separate = False
+
+    def _real_extract(self, url):
+        type(self).calls += 1
+        video_id = self._match_id(url)
+        formats = [{
+            'format_id': '18',
+            'url': self.media_url,
+            'ext': 'mp4',
+            'protocol': 'http',
+            'vcodec': 'avc1',
+            'acodec': 'mp4a',
+        }]
+        if self.separate:
+            formats = [
+                {'format_id': '137', 'url': self.media_url, 'ext': 'mp4', 'protocol': 'http',
+                 'vcodec': 'avc1', 'acodec': 'none'},
+                {'format_id': '140', 'url': self.media_url, 'ext': 'm4a', 'protocol': 'http',
+                 'vcodec': 'none', 'acodec': 'mp4a'},
+            ]
+        return {
+            'id': video_id,
+            'title': 'Test Video',
+            'duration': 1,
+            'formats': formats,
+        }
+
+class CountingYoutubeDL(yt_dlp.YoutubeDL):
+    """Yalnızca CountingIE'yi tanıyan YoutubeDL"""
+
+    def __init__(self, params=None, auto_init=True):
+        super().__init__(params, auto_init=False)
+        self.add_info_extractor(CountingIE())
@@ -0,0 +1,52 @@
+import threading
+import time
+from src.controllers.bandwidth_governor import BandwidthGovernor
+
+RATE = 4 * 1024 * 1024
+CHUNK = 64 * 1024
+
+def consume_all(governor, jobs, per_job):
+    def worker(key):
+        for _ in range(per_job // CHUNK):
+            governor.consume(key, CHUNK)
+
+    threads = [threading.Thread(target=worker, args=(key,)) for key in range(jobs)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.monotonic() - start
+
+def test_total_rate_is_capped():
+    governor = BandwidthGovernor(RATE, burst_seconds=0.1)
+    total = 3 * 512 * 1024
+    elapsed = consume_all(governor, 3, 512 * 1024)
+    # Son parça borçla alınabildiği için süre en fazla birkaç parça kadar kısalır
+    assert elapsed >= (total - 3 * CHUNK) / RATE
+    assert elapsed < total / RATE * 2
+
+def test_jobs_share_bandwidth_fairly():
+    governor = BandwidthGovernor(RATE, burst_seconds=0.1)
+    served = {}
+    stop = time.monotonic() + 0.5
+
+    def worker(key, chunk):
+        while time.monotonic() < stop:
+            governor.consume(key, chunk)
+            served[key] = served.get(key, 0) + chunk
+
+    threads = [threading.Thread(target=worker, args=('small', CHUNK // 4)),
+               threading.Thread(target=worker, args=('large', CHUNK))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Süre dolarken verilen son izinler dışında iki iş eşit bayt almalı
+    assert abs(served['small'] - served['large']) <= 2 * CHUNK
+
+def test_no_limit_does_not_wait():
+    governor = BandwidthGovernor(None)
+    start = time.monotonic()
+    governor.consume(1, 10 ** 9)
+    assert time.monotonic() - start < 0.05
@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from src.controllers.auth_controller import AuthController
+from src.controllers.daemon_server import DaemonServer
+from src.database.database import Database
+from src.models.download_job import DownloadJob
+
+VIDEO = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+
+class FakeQueue:
+    """Yalnızca daemon'un kullandığı yöntemleri taklit eder"""
+
+    def __init__(self):
+        self.jobs = {}
+
+    def submit(self, url, download_path, format_id='best', user_id=None, **options):
+        job = DownloadJob(len(self.jobs) + 1, url, download_path, format_id, user_id, **options)
+        self.jobs[job.id] = job
+        return job
+
+    def get_job(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        self.jobs[job_id].state = DownloadJob.CANCELLED
+        return True
+
+@pytest.fixture
+def daemon(tmp_path):
+    db = Database(str(tmp_path / 'test.db'))
+    db.migrate()
+    auth = AuthController(db)
+    auth.register('ayse', 'sifre1', 'ayse@example.com')
+    auth.register('mehmet', 'sifre2', 'mehmet@example.com')
+    root = tmp_path / 'downloads'
+    root.mkdir()
+    server = DaemonServer(('127.0.0.1', 0), FakeQueue(), auth, str(root))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def call(server, method, path, data=None, token=None):
+    request = urllib.request.Request(
+        f'http://127.0.0.1:{server.server_port}{path}', method=method,
+        data=json.dumps(data).encode('utf-8') if data is not None else None)
+    if token:
+        request.add_header('Authorization', f'Bearer {token}')
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def login(server, username, password):
+    status, body = call(server, 'POST', '/session', {'username': username, 'password': password})
+    assert status == 201
+    return body['token']
+
+def test_requests_without_session_are_rejected(daemon):
+    assert call(daemon, 'GET', '/jobs')[0] == 401
+    assert call(daemon, 'POST', '/jobs', {'url': VIDEO})[0] == 401
+    assert call(daemon, 'GET', '/jobs', token='yanlis')[0] == 401
+    assert call(daemon, 'POST', '/session', {'username': 'ayse', 'password': 'yanlis'})[0] == 401
+    assert daemon.download_queue.jobs == {}
+
+def test_jobs_belong_to_session_user(daemon):
+    ayse = login(daemon, 'ayse', 'sifre1')
+    mehmet = login(daemon, 'mehmet', 'sifre2')
+
+    status, job = call(daemon, 'POST', '/jobs', {'url': VIDEO}, ayse)
+    assert status == 201
+    assert job['user_id'] == daemon.session_user(ayse).id
+
+    assert len(call(daemon, 'GET', '/jobs', token=ayse)[1]) == 1
+    assert call(daemon, 'GET', '/jobs', token=mehmet)[1] == []
+    assert call(daemon, 'GET', f"/jobs/{job['id']}", token=mehmet)[0] == 404
+    assert call(daemon, 'POST', f"/jobs/{job['id']}/cancel", token=mehmet)[0] == 404
+    assert call(daemon, 'POST', f"/jobs/{job['id']}/cancel", token=ayse)[0] == 200
+
+def test_download_path_stays_under_root(daemon):
+    token = login(daemon, 'ayse', 'sifre1')
+
+    status, job = call(daemon, 'POST', '/jobs', {'url': VIDEO, 'download_path': 'muzik/pop'}, token)
+    assert status == 201
+    assert job['download_path'].startswith(daemon.download_path)
+    assert os.path.isdir(job['download_path'])
+
+    for path in ('/etc', '../disari', 'muzik/../../disari'):
+        status, _ = call(daemon, 'POST', '/jobs', {'url': VIDEO, 'download_path': path}, token)
+        assert status == 400
+    assert len(daemon.download_queue.jobs) == 1
+
+def test_job_options_are_validated(daemon):
+    token = login(daemon, 'ayse', 'sifre1')
+
+    status, job = call(daemon, 'POST', '/jobs', {'url': VIDEO, 'connections': 5000}, token)
+    assert status == 201
+    assert job['connections'] == 8
+
+    status, _ = call(daemon, 'POST', '/jobs', {'url': VIDEO, 'stream_audio': 'false'}, token)
+    assert status == 400
+    status, job = call(daemon, 'POST', '/jobs', {'url': VIDEO, 'stream_audio': False}, token)
+    assert status == 201
+    assert job['stream_audio'] is False
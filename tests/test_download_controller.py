@@ -0,0 +1,60 @@
+import pytest
+from src.controllers.download_controller import DownloadController
+from src.database.database import Database
+from src.database.write_behind import WriteBehindQueue
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'test.db'))
+    db.migrate()
+    with db.conn as conn:
+        conn.execute("INSERT INTO users (username, password, email) VALUES ('ayse', 'x', 'a@b.c')")
+    return db
+
+@pytest.mark.parametrize('flush_interval', [0, 0.05])
+def test_delete_reports_result(db, flush_interval):
+    writer = WriteBehindQueue(db, flush_interval=flush_interval)
+    controller = DownloadController(db, writer)
+    events = []
+    controller.add_listener(lambda event, download: events.append((event, download.id)))
+
+    controller.add_download(1, 'Video', 'https://youtu.be/x', '/tmp', 'video')
+    writer.flush()
+    download_id = events[0][1]
+
+    controller.delete_download(download_id, 1)
+    controller.delete_download(download_id, 1)
+    writer.flush()
+    writer.close()
+
+    assert events == [('inserted', download_id), ('deleted', download_id),
+                      ('failed', download_id)]
+
+@pytest.mark.parametrize('flush_interval', [0, 0.05])
+def test_failed_write_is_reported(db, flush_interval):
+    writer = WriteBehindQueue(db, flush_interval=flush_interval)
+    controller = DownloadController(db, writer)
+    events = []
+    controller.add_listener(lambda event, download: events.append((event, download.id)))
+    with db.conn as conn:
+        conn.execute('DROP TABLE downloads')
+
+    controller.add_download(1, 'Video', 'https://youtu.be/x', '/tmp', 'video')
+    controller.delete_download(7, 1)
+    writer.flush()
+    writer.close()
+
+    assert events == [('failed', None), ('failed', 7)]
+
+def test_existing_download_matches_equivalent_folders(db, tmp_path, monkeypatch):
+    folder = tmp_path / 'videolar'
+    folder.mkdir()
+    (folder / 'a.mp4').write_bytes(b'x')
+    controller = DownloadController(db)
+    controller.add_download(1, 'Video', 'https://youtu.be/x', str(folder) + '/', 'video',
+                            video_id='abc', file_name='a.mp4')
+
+    monkeypatch.chdir(tmp_path)
+    assert controller.find_existing_download('abc', 'video', 'videolar') is not None
+    assert controller.find_existing_download('abc', 'video', str(folder)) is not None
+    assert controller.find_existing_download('abc', 'video', str(tmp_path)) is None
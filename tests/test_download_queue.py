@@ -0,0 +1,157 @@
+import threading
+import time
+import pytest
+from src.controllers import download_queue as module
+from src.controllers.disk_space_guard import InsufficientDiskSpace
+from src.controllers.download_queue import DownloadQueue
+from src.controllers.download_task import JobCancelled, JobPaused, JobPreempted
+from src.controllers.retry_policy import RetryPolicy, CircuitBreaker
+from src.models.download_job import DownloadJob, FORMATS
+
+def running_job(download_queue, job_id, priority, **options):
+    job = DownloadJob(job_id, 'https://www.youtube.com/watch?v=dQw4w9WgXcQ', '.',
+                      priority=priority, **options)
+    job.state = DownloadJob.RUNNING
+    download_queue.jobs[job_id] = job
+    return job
+
+def queued_job(download_queue, job_id, priority):
+    job = DownloadJob(job_id, 'https://www.youtube.com/watch?v=dQw4w9WgXcQ', '.',
+                      priority=priority)
+    download_queue.jobs[job_id] = job
+    return job
+
+def test_preemption_skips_streaming_audio():
+    download_queue = DownloadQueue(max_workers=2)
+    try:
+        streaming = running_job(download_queue, 1, 0, format_id=FORMATS['audio'],
+                                stream_audio=True)
+        video = running_job(download_queue, 2, 1)
+        urgent = queued_job(download_queue, 3, 5)
+
+        download_queue._preempt_for(urgent)
+
+        assert not streaming.resumable
+        assert not streaming.preempt_requested
+        assert video.preempt_requested
+    finally:
+        download_queue.shutdown()
+
+def test_only_streaming_jobs_running_are_not_preempted():
+    download_queue = DownloadQueue(max_workers=1)
+    try:
+        streaming = running_job(download_queue, 1, 0, format_id=FORMATS['audio'],
+                                stream_audio=True)
+        download_queue._preempt_for(queued_job(download_queue, 2, 5))
+        assert not streaming.preempt_requested
+    finally:
+        download_queue.shutdown()
+
+def test_running_streaming_audio_cannot_be_paused():
+    download_queue = DownloadQueue(max_workers=1)
+    try:
+        streaming = running_job(download_queue, 1, 0, format_id=FORMATS['audio'],
+                                stream_audio=True)
+        video = running_job(download_queue, 2, 0)
+
+        assert download_queue.pause(1) is False
+        assert not streaming.pause_requested
+        assert download_queue.pause(2) is True
+        assert video.pause_requested
+    finally:
+        download_queue.shutdown()
+
+def test_discovery_waits_for_queue_to_drain(monkeypatch):
+    urls = [f'https://www.youtube.com/watch?v=video{i:06d}' for i in range(30)]
+    monkeypatch.setattr(module, 'iter_collection_entries', lambda url: iter(urls))
+    monkeypatch.setattr(module, 'DISCOVERY_POLL_INTERVAL', 0.01)
+    release = threading.Event()
+
+    def run_job(self, job):
+        release.wait()
+        job.state = DownloadJob.COMPLETED
+
+    monkeypatch.setattr(DownloadQueue, '_run_job', run_job)
+    download_queue = DownloadQueue(max_workers=1)
+    try:
+        thread = download_queue.submit_collection('https://www.youtube.com/playlist?list=x', '.')
+        time.sleep(0.3)
+        # Bir iş çalışır, kalanlar işçi başına sınırda bekler
+        assert len(download_queue.jobs) == 1 + module.DISCOVERY_BACKLOG_PER_WORKER
+        release.set()
+        thread.join(5)
+        assert len(download_queue.jobs) == len(urls)
+    finally:
+        download_queue.shutdown()
+
+def test_duplicate_of_paused_job_gets_its_own_message(tmp_path):
+    download_queue = DownloadQueue(max_workers=1)
+    # İşçiler durdurulur, işler kuyrukta kalır
+    download_queue.shutdown(wait=True)
+    url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+
+    first = download_queue.submit(url, str(tmp_path))
+    download_queue.pause(first.id)
+    second = download_queue.submit(url, str(tmp_path) + '/')
+
+    assert first.state == DownloadJob.PAUSED
+    assert second.state == DownloadJob.SKIPPED
+    assert second.duplicate_of == first.id
+    assert 'duraklatılmış' in second.error
+
+class FakeTask:
+    """Ağa çıkmadan tam yt-dlp bilgisi bırakan DownloadTask"""
+
+    def __init__(self, job, **options):
+        self.job = job
+        self.pending = None
+
+    def run(self):
+        self.job.info = {'id': 'x', 'title': 'Video', 'duration': 3, 'formats': [{}] * 100}
+
+def test_finished_jobs_are_trimmed_and_evicted(monkeypatch):
+    monkeypatch.setattr(module, 'DownloadTask', FakeTask)
+    finished = []
+    download_queue = DownloadQueue(max_workers=1, keep_finished=2)
+    download_queue.add_listener(lambda event, job: event == 'finished' and finished.append(job))
+    try:
+        for i in range(5):
+            download_queue.submit(f'https://www.youtube.com/watch?v=video{i:06d}', '.')
+        deadline = time.monotonic() + 5
+        while len(finished) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        download_queue.shutdown()
+
+    assert [job.id for job in finished] == [1, 2, 3, 4, 5]
+    assert sorted(download_queue.jobs) == [4, 5]
+    assert finished[-1].info == {'id': 'x', 'title': 'Video', 'duration': 3}
+
+class FailingTask(FakeTask):
+    error = None
+
+    def run(self):
+        raise self.error
+
+@pytest.mark.parametrize('error', [
+    JobCancelled(), JobPaused(), JobPreempted(),
+    InsufficientDiskSpace(10 << 20, 0),
+    InsufficientDiskSpace(10 << 20, 0, waiting=True),
+    RuntimeError('Video unavailable'),
+    ConnectionResetError('Connection reset by peer'),
+])
+def test_every_exit_path_releases_probe(monkeypatch, error):
+    monkeypatch.setattr(FailingTask, 'error', error)
+    monkeypatch.setattr(module, 'DownloadTask', FailingTask)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    download_queue = DownloadQueue(max_workers=1, circuit_breaker=breaker,
+                                   retry_policy=RetryPolicy())
+    download_queue.shutdown(wait=True)
+    breaker.record_failure('youtube.com')
+    time.sleep(0.02)
+
+    job = running_job(download_queue, 1, 0)
+    download_queue._run_job(job)
+
+    # Deneme hakkı bırakıldıysa sonraki iş hemen başlayabilir
+    assert breaker.blocked_for('youtube.com') == 0
@@ -0,0 +1,76 @@
+import os
+import pytest
+from helpers import CountingIE, VIDEO_URL, VIDEO_ID
+from src.controllers.download_task import DownloadTask, JobCancelled
+from src.controllers.postprocessing import PostProcessingPool
+from src.database.database import Database
+from src.database.metadata_cache import MetadataCache
+from src.models.download_job import DownloadJob
+
+def make_job(path, job_id=1):
+    return DownloadJob(job_id, VIDEO_URL, str(path), 'best')
+
+def test_run_extracts_once_and_downloads(tmp_path, counting_ydl):
+    job = make_job(tmp_path)
+    DownloadTask(job).run()
+
+    assert CountingIE.calls == 1
+    with open(job.info['requested_downloads'][0]['filepath'], 'rb') as f:
+        assert f.read() == counting_ydl.data
+
+def test_cached_metadata_skips_extraction(tmp_path, counting_ydl):
+    db = Database(str(tmp_path / 'test.db'))
+    db.migrate()
+    cache = MetadataCache(db)
+
+    DownloadTask(make_job(tmp_path / 'a'), metadata_cache=cache).run()
+    DownloadTask(make_job(tmp_path / 'b', 2), metadata_cache=cache).run()
+
+    assert CountingIE.calls == 1
+    assert cache.get(VIDEO_ID)['id'] == VIDEO_ID
+    assert os.listdir(tmp_path / 'b')
+
+class RecordingGovernor:
+    def __init__(self):
+        self.consumed = []
+
+    def consume(self, job_id, amount):
+        self.consumed.append(amount)
+
+def test_throttle_hook_skips_resumed_bytes(tmp_path):
+    governor = RecordingGovernor()
+    task = DownloadTask(make_job(tmp_path), governor=governor)
+    resumed = 50 * 1024 * 1024
+
+    for downloaded in (resumed + 1024, resumed + 3072, resumed + 7168):
+        task.throttle_hook({'status': 'downloading', 'filename': 'video.mp4.part',
+                            'downloaded_bytes': downloaded})
+    task.throttle_hook({'status': 'downloading', 'filename': 'audio.m4a.part',
+                        'downloaded_bytes': 2048})
+    task.throttle_hook({'status': 'downloading', 'filename': 'audio.m4a.part',
+                        'downloaded_bytes': 4096})
+
+    assert governor.consumed == [2048, 4096, 2048]
+
+def test_separate_streams_create_missing_folder(tmp_path, counting_ydl, monkeypatch):
+    monkeypatch.setattr(CountingIE, 'separate', True)
+    pool = PostProcessingPool(max_workers=1)
+    job = make_job(tmp_path / 'yeni' / 'klasor')
+    try:
+        task = DownloadTask(job, postprocessing=pool)
+        task.run()
+        assert task.pending is not None
+        assert os.path.isdir(job.download_path)
+    finally:
+        pool.shutdown()
+
+def test_cancel_removes_partial_files(tmp_path, counting_ydl):
+    job = make_job(tmp_path)
+
+    def cancel(job):
+        job.cancel_requested = True
+
+    with pytest.raises(JobCancelled):
+        DownloadTask(job, on_progress=cancel).run()
+
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,75 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import pytest
+from src.database.database import Database
+from src.database.job_journal import JobJournal
+from src.models.download_job import DownloadJob
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'test.db'))
+    db.migrate()
+    return db
+
+def make_job(job_id=1, **options):
+    job = DownloadJob(job_id, f'https://youtu.be/abcdefghij{job_id}', '/tmp', 'bestaudio/best',
+                      user_id=7, **options)
+    return job
+
+def live_owner():
+    return f'{socket.gethostname()}:{os.getppid()}'
+
+def dead_owner():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return f'{socket.gethostname()}:{process.pid}'
+
+def test_live_owner_keeps_its_jobs(db):
+    other = JobJournal(db, owner=live_owner())
+    other.create(make_job())
+    try:
+        assert JobJournal(db).claim_unfinished() == []
+    finally:
+        other.close()
+
+def test_stale_and_dead_owners_are_claimed_once(db):
+    stale = JobJournal(db, owner='baska-makine:1')
+    stale_id = stale.create(make_job(1))
+    db.conn.execute("UPDATE download_jobs SET updated_at = datetime('now', '-1 hour') "
+                    'WHERE id = ?', (stale_id,))
+    db.conn.commit()
+    dead_id = JobJournal(db, owner=dead_owner()).create(make_job(2))
+
+    claimed = JobJournal(db).claim_unfinished()
+    assert [row['id'] for row in claimed] == [stale_id, dead_id]
+    # Devralan süreç canlı olduğu için kayıtlar artık başkasına verilmez
+    assert JobJournal(db, owner=dead_owner()).claim_unfinished() == []
+
+def test_concurrent_claims_do_not_overlap(tmp_path, db):
+    writer = JobJournal(db, owner=dead_owner())
+    for i in range(20):
+        writer.create(make_job(i))
+
+    results = []
+
+    def claim(owner):
+        journal = JobJournal(Database(str(tmp_path / 'test.db')), owner=owner)
+        results.append(journal.claim_unfinished())
+
+    threads = [threading.Thread(target=claim, args=(f'yerel:{i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [row['id'] for rows in results for row in rows]
+    assert sorted(ids) == list(range(1, 21))
+
+def test_options_are_journaled(db):
+    JobJournal(db, owner=dead_owner()).create(make_job(1, connections=4, priority=5,
+                                                       stream_audio=True))
+    row, = JobJournal(db).claim_unfinished()
+    assert (row['connections'], row['priority'], row['stream_audio']) == (4, 5, 1)
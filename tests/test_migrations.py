@@ -0,0 +1,76 @@
+import sqlite3
+import pytest
+from src.database.migrations import migrate, schema_version, MIGRATIONS, LATEST_VERSION
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    yield conn
+    conn.close()
+
+def columns(conn, table):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+def applied(conn):
+    return [row[0] for row in conn.execute('SELECT version FROM schema_version ORDER BY version')]
+
+def test_fresh_database_reaches_latest_version(conn):
+    assert schema_version(conn) == 0
+    assert migrate(conn) == LATEST_VERSION
+    assert applied(conn) == [version for version, _, _ in MIGRATIONS]
+    assert 'owner' in columns(conn, 'download_jobs')
+
+def test_adopts_pre_versioning_database(conn):
+    # Sürüm tablosundan önceki create_tables'ın bıraktığı şema ve veri
+    conn.execute('''CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL, password TEXT NOT NULL,
+                    email TEXT UNIQUE NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    conn.execute('''CREATE TABLE downloads (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+                    title TEXT NOT NULL, url TEXT NOT NULL, file_path TEXT NOT NULL,
+                    file_type TEXT NOT NULL, download_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    conn.execute("INSERT INTO downloads (user_id, title, url, file_path, file_type) "
+                 "VALUES (1, 'Eski', 'https://youtu.be/x', '/tmp', 'video')")
+    conn.commit()
+
+    assert migrate(conn) == LATEST_VERSION
+    assert {'video_id', 'file_name', 'file_size', 'duration'} <= set(columns(conn, 'downloads'))
+    assert conn.execute('SELECT title FROM downloads').fetchall() == [('Eski',)]
+
+def test_applied_steps_are_skipped(conn):
+    calls = []
+
+    def step(version):
+        def run(cursor):
+            calls.append(version)
+            cursor.execute(f'CREATE TABLE t{version} (id INTEGER)')
+        return run
+
+    migrations = [(1, 'bir', step(1)), (2, 'iki', step(2))]
+    assert migrate(conn, migrations) == 2
+    assert migrate(conn, migrations) == 2
+
+    migrations.append((3, 'üç', step(3)))
+    assert migrate(conn, migrations) == 3
+    assert calls == [1, 2, 3]
+
+def test_failed_step_is_rolled_back(conn):
+    def good(cursor):
+        cursor.execute('CREATE TABLE good (id INTEGER)')
+
+    def bad(cursor):
+        cursor.execute('CREATE TABLE half (id INTEGER)')
+        cursor.execute('INSERT INTO missing VALUES (1)')
+
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(conn, [(1, 'iyi', good), (2, 'hatalı', bad), (3, 'sonraki', good)])
+
+    assert schema_version(conn) == 1
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+    assert 'good' in tables and 'half' not in tables
+    assert not conn.in_transaction
+
+    # Hata giderilince kalan adımlar sürümden devam eder
+    def fixed(cursor):
+        cursor.execute('CREATE TABLE half (id INTEGER)')
+
+    assert migrate(conn, [(1, 'iyi', good), (2, 'düzeltildi', fixed)]) == 2
@@ -0,0 +1,124 @@
+import os
+import pytest
+from src.utils.ranged_download import (ranged_download, split_ranges, MIN_SEGMENT_SIZE,
+                                       PART_SUFFIX, STATE_SUFFIX)
+
+DATA = os.urandom(3 * MIN_SEGMENT_SIZE + 12345)
+
+def test_split_ranges_covers_file():
+    ranges = split_ranges(len(DATA), 4)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(DATA) - 1
+    assert all(a[1] + 1 == b[0] for a, b in zip(ranges, ranges[1:]))
+
+def test_split_ranges_respects_chunk_size():
+    chunk = MIN_SEGMENT_SIZE // 2
+    ranges = split_ranges(len(DATA), 2, chunk)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(DATA) - 1
+    assert all(end - start + 1 <= chunk for start, end in ranges)
+
+def test_parallel_ranges_reassemble_file(tmp_path, serve):
+    server = serve(DATA)
+    target = tmp_path / 'video.mp4'
+    progress = []
+    throttled = []
+
+    downloaded = ranged_download(server.url, str(target), connections=4,
+                                 progress_callback=lambda d, t: progress.append((d, t)),
+                                 throttle=throttled.append)
+
+    assert downloaded == len(DATA)
+    assert target.read_bytes() == DATA
+    assert sum(throttled) == len(DATA)
+    assert progress[-1] == (len(DATA), len(DATA))
+    assert sum(1 for r in server.requests if r and r != 'bytes=0-0') == 3
+    assert not os.path.exists(str(target) + PART_SUFFIX)
+    assert not os.path.exists(str(target) + STATE_SUFFIX)
+
+def test_falls_back_to_single_connection(tmp_path, serve):
+    server = serve(DATA, supports_range=False)
+    target = tmp_path / 'video.mp4'
+
+    assert ranged_download(server.url, str(target), connections=4) == len(DATA)
+    assert target.read_bytes() == DATA
+    assert server.requests == ['bytes=0-0', None]
+
+def test_chunk_size_limits_each_request(tmp_path, serve):
+    server = serve(DATA)
+    target = tmp_path / 'video.mp4'
+    chunk = MIN_SEGMENT_SIZE // 2
+
+    ranged_download(server.url, str(target), connections=2, chunk_size=chunk)
+
+    assert target.read_bytes() == DATA
+    requested = [r for r in server.requests if r and r != 'bytes=0-0']
+    assert len(requested) == -(-len(DATA) // chunk)
+    for byte_range in requested:
+        start, end = map(int, byte_range[len('bytes='):].split('-'))
+        assert end - start + 1 <= chunk
+
+def test_interrupted_download_resumes(tmp_path, serve):
+    server = serve(DATA)
+    target = tmp_path / 'video.mp4'
+
+    class Abort(Exception):
+        pass
+
+    def abort_midway(downloaded, total):
+        if downloaded >= len(DATA) // 2:
+            raise Abort()
+
+    with pytest.raises(Abort):
+        ranged_download(server.url, str(target), connections=2,
+                        chunk_size=MIN_SEGMENT_SIZE // 2, progress_callback=abort_midway)
+    assert os.path.exists(str(target) + PART_SUFFIX)
+    assert os.path.exists(str(target) + STATE_SUFFIX)
+    assert not target.exists()
+
+    server.requests.clear()
+    throttled = []
+    progress = []
+    ranged_download(server.url, str(target), connections=2,
+                    chunk_size=MIN_SEGMENT_SIZE // 2,
+                    progress_callback=lambda d, t: progress.append(d),
+                    throttle=throttled.append)
+
+    assert target.read_bytes() == DATA
+    # Yalnızca eksik kalan baytlar yeniden istenir
+    assert progress[0] >= len(DATA) // 2
+    assert sum(throttled) == len(DATA) - progress[0]
+    assert not os.path.exists(str(target) + STATE_SUFFIX)
+
+def test_dropped_connection_keeps_progress(tmp_path, serve):
+    server = serve(DATA)
+    server.fail_after = MIN_SEGMENT_SIZE // 4
+    target = tmp_path / 'video.mp4'
+
+    with pytest.raises(Exception):
+        ranged_download(server.url, str(target), connections=1)
+
+    server.fail_after = None
+    server.requests.clear()
+    throttled = []
+    ranged_download(server.url, str(target), connections=1, throttle=throttled.append)
+
+    assert target.read_bytes() == DATA
+    assert sum(throttled) < len(DATA)
+    assert server.requests[1].startswith(f'bytes={MIN_SEGMENT_SIZE // 4}-')
+
+def test_failed_single_connection_removes_partial(tmp_path, serve):
+    server = serve(DATA, supports_range=False)
+    server.fail_after = MIN_SEGMENT_SIZE
+    target = tmp_path / 'video.mp4'
+
+    with pytest.raises(Exception):
+        ranged_download(server.url, str(target))
+
+    assert os.listdir(tmp_path) == []
+
+def test_creates_missing_folder(tmp_path, serve):
+    server = serve(DATA)
+    target = tmp_path / 'yeni' / 'klasor' / 'video.mp4'
+
+    ranged_download(server.url, str(target), connections=2)
+
+    assert target.read_bytes() == DATA
@@ -0,0 +1,115 @@
+import errno
+import urllib.error
+import pytest
+import yt_dlp
+from src.controllers import retry_policy as module
+from src.controllers.disk_space_guard import InsufficientDiskSpace
+from src.controllers.retry_policy import (RetryPolicy, CircuitBreaker, TRANSIENT, THROTTLED,
+                                          PERMANENT, host_of)
+
+def http_error(code):
+    return urllib.error.HTTPError('https://example.com', code, 'error', {}, None)
+
+def wrapped(error):
+    """yt-dlp'nin hatayı sarmaladığı DownloadError'u üretir"""
+    return yt_dlp.utils.DownloadError(f'ERROR: {error}', exc_info=(type(error), error, None))
+
+def raised_from(error):
+    try:
+        try:
+            raise error
+        except Exception as cause:
+            raise RuntimeError('Video indirilemedi') from cause
+    except RuntimeError as e:
+        return e
+
+@pytest.mark.parametrize('error, kind', [
+    (OSError(errno.ENOSPC, 'No space left on device'), PERMANENT),
+    (InsufficientDiskSpace(10 << 20, 0), PERMANENT),
+    (OSError(errno.EACCES, 'Permission denied'), PERMANENT),
+    (http_error(404), PERMANENT),
+    (http_error(410), PERMANENT),
+    (http_error(429), THROTTLED),
+    (http_error(403), THROTTLED),
+    (http_error(500), TRANSIENT),
+    (http_error(503), TRANSIENT),
+    (ConnectionResetError('Connection reset by peer'), TRANSIENT),
+    (TimeoutError('timed out'), TRANSIENT),
+    (RuntimeError('Video unavailable'), PERMANENT),
+    (IOError('Bağlantı erken kapandı'), TRANSIENT),
+    (RuntimeError('beklenmeyen bir şey'), TRANSIENT),
+])
+def test_classify_follows_error_chain(error, kind):
+    policy = RetryPolicy()
+    assert policy.classify(error) == kind
+    assert policy.classify(wrapped(error)) == kind
+    assert policy.classify(raised_from(error)) == kind
+
+def test_classify_reads_status_from_message():
+    policy = RetryPolicy()
+    assert policy.classify(RuntimeError('HTTP Error 502: Bad Gateway')) == TRANSIENT
+    assert policy.classify(RuntimeError('HTTP Error 404: Not Found')) == PERMANENT
+
+def test_backoff_grows_with_jitter_and_cap():
+    policy = RetryPolicy(max_attempts=4, base_delay=2.0, max_delay=10.0)
+    for attempts, ceiling in ((1, 2.0), (2, 4.0), (3, 8.0), (4, 10.0), (9, 10.0)):
+        for _ in range(20):
+            assert ceiling / 2 <= policy.delay(attempts) <= ceiling
+
+    assert policy.should_retry(TRANSIENT, 3)
+    assert not policy.should_retry(TRANSIENT, 4)
+    assert not policy.should_retry(PERMANENT, 1)
+
+def test_host_of_groups_youtube_subdomains():
+    assert host_of('https://www.youtube.com/watch?v=x') == 'youtube.com'
+    assert host_of('https://music.youtube.com/watch?v=x') == 'youtube.com'
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(module.time, 'monotonic', clock)
+    return clock
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60.0)
+    breaker.record_failure('youtube.com')
+    breaker.record_failure('youtube.com')
+    assert breaker.blocked_for('youtube.com') == 0
+
+    breaker.record_failure('youtube.com')
+    assert breaker.blocked_for('youtube.com') == 60.0
+    assert breaker.blocked_for('example.com') == 0
+
+def test_half_open_allows_single_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    breaker.record_failure('youtube.com')
+    clock.now += 61
+
+    assert breaker.blocked_for('youtube.com') == 0
+    # Deneme sürerken diğer işler bekler
+    assert breaker.blocked_for('youtube.com') > 0
+
+    breaker.abort_probe('youtube.com')
+    assert breaker.blocked_for('youtube.com') == 0
+
+def test_probe_success_closes_and_failure_doubles_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0, max_timeout=100.0)
+    breaker.record_failure('youtube.com')
+    clock.now += 61
+    assert breaker.blocked_for('youtube.com') == 0
+
+    breaker.record_failure('youtube.com')
+    assert breaker.blocked_for('youtube.com') == 100.0
+
+    clock.now += 101
+    assert breaker.blocked_for('youtube.com') == 0
+    breaker.record_success('youtube.com')
+    assert breaker.blocked_for('youtube.com') == 0
+    assert breaker.blocked_for('youtube.com') == 0
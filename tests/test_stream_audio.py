@@ -0,0 +1,38 @@
+import os
+import shutil
+import pytest
+from helpers import make_wav
+from src.controllers.postprocessing import stream_audio
+
+pytestmark = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='ffmpeg bulunamadı')
+
+def test_streams_to_mp3_without_intermediate_file(tmp_path, serve):
+    data = make_wav()
+    server = serve(data)
+    target = tmp_path / 'song.mp3'
+    progress = []
+
+    downloaded = stream_audio(server.url, str(target),
+                              progress_callback=lambda d, t: progress.append((d, t)))
+
+    assert downloaded == len(data)
+    assert progress[-1] == (len(data), len(data))
+    header = target.read_bytes()[:3]
+    assert header == b'ID3' or header[:2] == b'\xff\xfb'
+    assert os.listdir(tmp_path) == ['song.mp3']
+
+def test_failed_conversion_leaves_no_files(tmp_path, serve):
+    server = serve(b'not audio' * 1000)
+    target = tmp_path / 'song.mp3'
+
+    with pytest.raises(RuntimeError):
+        stream_audio(server.url, str(target))
+    assert os.listdir(tmp_path) == []
+
+def test_creates_missing_folder(tmp_path, serve):
+    server = serve(make_wav())
+    target = tmp_path / 'yeni' / 'song.mp3'
+
+    stream_audio(server.url, str(target))
+
+    assert os.listdir(tmp_path / 'yeni') == ['song.mp3']